@@ -0,0 +1,236 @@
+# ada_interface.py – ADA decision model, goal rules and speech output
+#
+# Kept free of Tk so the pipeline can run headless (see headless_runner.py).
+
+import threading
+import numpy as np
+from collections import OrderedDict
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.model_selection import train_test_split
+from sklearn.metrics import mean_squared_error
+from instrumentation import timed
+from ai_ada_engine.compiled_tree import CompiledTree
+
+# Messages waiting to be spoken; the oldest is dropped beyond this
+SPEECH_QUEUE_SIZE = 8
+
+def generate_quantum_data(num_samples=100):
+    entanglement_density = np.random.uniform(0.4, 0.6, num_samples)
+    phase_alignment = np.random.uniform(0.4, 0.6, num_samples)
+    information_flow_1 = np.random.randint(450, 550, num_samples)
+    information_flow_2 = np.random.randint(450, 550, num_samples)
+    return np.column_stack([entanglement_density, phase_alignment, information_flow_1, information_flow_2])
+
+# Status labels per goal, indexed by status code (0 = failing, 1 = passing)
+GOAL_LABELS = {
+    "Ecology": ("Warning: Ecological instability", "Stable"),
+    "Markets": ("Market imbalance detected", "Stable"),
+    "Cognition": ("Lagging", "Progressing"),
+    "Existence": ("Elevated Threat", "Safe")
+}
+
+SCENARIO_GOALS = {
+    "Prevent Ecological Collapse": "Ecology",
+    "Stabilize Global Markets": "Markets",
+    "Enhance Cognitive Evolution": "Cognition",
+    "Minimize Existential Risk": "Existence"
+}
+
+def evaluate_goal_codes(ent, phase, info1, info2):
+    """
+    Vectorized goal rules: one uint8 status code array per goal.
+    """
+    masks = {
+        "Ecology": (ent < 0.5) & (phase > 0.6),
+        "Markets": np.abs(info1 - info2) < 10,
+        "Cognition": (ent > 0.55) & (phase > 0.55),
+        "Existence": (ent > 0.45) & (phase > 0.45)
+    }
+    return {goal: mask.astype(np.uint8) for goal, mask in masks.items()}
+
+def decode_goal_status(codes, goal):
+    """
+    Map status codes back to their labels for display.
+    """
+    return np.asarray(GOAL_LABELS[goal], dtype=object)[codes]
+
+class SilentSpeechEngine:
+    """
+    pyttsx3 stand-in for headless runs: accepts messages and discards them.
+    """
+    def __init__(self):
+        self.messages_spoken = 0
+
+    def getProperty(self, name):
+        return []
+
+    def setProperty(self, name, value):
+        pass
+
+    def say(self, message):
+        self.messages_spoken += 1
+
+    def runAndWait(self):
+        pass
+
+class SpeechQueue:
+    """
+    Speaks messages on a dedicated worker thread so callers never block on TTS.
+
+    Messages sharing a coalesce_key replace each other while waiting, so only
+    the latest one is spoken; beyond max_pending the oldest message is dropped.
+    The engine is created by engine_factory on the worker thread itself,
+    since pyttsx3 engines must stay on the thread that created them.
+    """
+    def __init__(self, engine_factory, max_pending=SPEECH_QUEUE_SIZE):
+        self.engine_factory = engine_factory
+        self.max_pending = max_pending
+        self.pending = OrderedDict()
+        self.condition = threading.Condition()
+        self.closed = False
+        self.next_id = 0
+        self.stats = {'queued': 0, 'spoken': 0, 'coalesced': 0, 'dropped': 0}
+        self.worker = threading.Thread(target=self.worker_loop, name="ada-speech", daemon=True)
+        self.worker.start()
+
+    def say(self, message, coalesce_key=None):
+        with self.condition:
+            if coalesce_key is not None and coalesce_key in self.pending:
+                del self.pending[coalesce_key]
+                self.stats['coalesced'] += 1
+            if coalesce_key is None:
+                coalesce_key = self.next_id
+                self.next_id += 1
+            self.pending[coalesce_key] = message
+            self.stats['queued'] += 1
+            while len(self.pending) > self.max_pending:
+                self.pending.popitem(last=False)
+                self.stats['dropped'] += 1
+            self.condition.notify()
+
+    def worker_loop(self):
+        engine = self.engine_factory()
+        while True:
+            with self.condition:
+                while not self.pending and not self.closed:
+                    self.condition.wait()
+                if not self.pending:
+                    return
+                _, message = self.pending.popitem(last=False)
+            engine.say(message)
+            engine.runAndWait()
+            with self.condition:
+                self.stats['spoken'] += 1
+
+    def pending_count(self):
+        with self.condition:
+            return len(self.pending)
+
+    def close(self, timeout=None):
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        self.worker.join(timeout)
+
+class ADAInterface:
+    def __init__(self, silent=False):
+        self.model = DecisionTreeRegressor(random_state=42)
+        self.speech = SpeechQueue(SilentSpeechEngine if silent else self.create_tts_engine)
+        self.train_model()
+        self.current_scenario = "Prevent Ecological Collapse"
+        self.goal_functions = {
+            "Prevent Ecological Collapse": self.evaluate_ecological_collapse,
+            "Stabilize Global Markets": self.evaluate_market_stability,
+            "Enhance Cognitive Evolution": self.evaluate_cognitive_evolution,
+            "Minimize Existential Risk": self.evaluate_existential_risk
+        }
+
+    def create_tts_engine(self):
+        import pyttsx3
+        engine = pyttsx3.init()
+        self.set_female_voice(engine)
+        return engine
+
+    def set_female_voice(self, engine):
+        voices = engine.getProperty('voices')
+        for voice in voices:
+            if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
+                engine.setProperty('voice', voice.id)
+                break
+        engine.setProperty('rate', 178)
+
+    def speak(self, message, coalesce_key=None):
+        # Returns immediately; the speech worker plays messages in order
+        self.speech.say(message, coalesce_key)
+
+    def train_model(self):
+        quantum_data = generate_quantum_data(100)
+        self.features = quantum_data[:, 1:]
+        self.labels = quantum_data[:, 0]
+        X_train, X_test, y_train, y_test = train_test_split(self.features, self.labels, test_size=0.2, random_state=42)
+        self.model.fit(X_train, y_train)
+        # Same predictions as self.model without sklearn's per-call overhead
+        self.compiled_model = CompiledTree.from_estimator(self.model)
+        mse = mean_squared_error(y_test, self.model.predict(X_test))
+        print(f'Model training complete. Mean Squared Error: {mse}')
+
+    def predict_outcome(self, phase_alignment, info1, info2):
+        return self.compiled_model.predict_one((phase_alignment, info1, info2))
+
+    @timed("analyze")
+    def analyze(self, quantum_output):
+        ent = quantum_output['entanglement_density']
+        phase = quantum_output['phase_alignment']
+        info1, info2 = quantum_output['information_flow']
+        predicted = self.predict_outcome(phase, info1, info2)
+        score = round(predicted * 100, 2)
+        evaluation = self.goal_functions[self.current_scenario](ent, phase, info1, info2)
+        multi_objective = self.evaluate_multi_goals(ent, phase, info1, info2)
+        return {
+            'predicted_entanglement_density': predicted,
+            'analysis_details': f"Phase Alignment: {phase}, Info Flow: {[info1, info2]}",
+            'influence_score': score,
+            'goal_evaluation': evaluation,
+            'multi_objective_summary': multi_objective
+        }
+
+    @timed("analyze_batch")
+    def analyze_batch(self, features_array, scenario=None):
+        """
+        Columnar analyze for an (n, 4) array of
+        [entanglement_density, phase_alignment, info_flow_1, info_flow_2] rows.
+        Goal statuses are uint8 codes; use decode_goal_status for labels.
+        """
+        features = np.asarray(features_array, dtype=float)
+        scenario = scenario or self.current_scenario
+        predicted = self.compiled_model.predict(features[:, 1:])
+        ent, phase, info1, info2 = features.T
+        codes = evaluate_goal_codes(ent, phase, info1, info2)
+        goal = SCENARIO_GOALS[scenario]
+        return {
+            'predicted_entanglement_density': predicted,
+            'influence_score': np.round(predicted * 100, 2),
+            'goal': goal,
+            'goal_evaluation': codes[goal],
+            'multi_objective_summary': codes
+        }
+
+    def evaluate_ecological_collapse(self, ent, phase, info1, info2):
+        return "Stable" if ent < 0.5 and phase > 0.6 else "Warning: Ecological instability"
+
+    def evaluate_market_stability(self, ent, phase, info1, info2):
+        return "Stable" if abs(info1 - info2) < 10 else "Market imbalance detected"
+
+    def evaluate_cognitive_evolution(self, ent, phase, info1, info2):
+        return "Progressing" if ent > 0.55 and phase > 0.55 else "Lagging"
+
+    def evaluate_existential_risk(self, ent, phase, info1, info2):
+        return "Safe" if ent > 0.45 and phase > 0.45 else "Elevated Threat"
+
+    def evaluate_multi_goals(self, ent, phase, info1, info2):
+        return {
+            "Ecology": self.evaluate_ecological_collapse(ent, phase, info1, info2),
+            "Markets": self.evaluate_market_stability(ent, phase, info1, info2),
+            "Cognition": self.evaluate_cognitive_evolution(ent, phase, info1, info2),
+            "Existence": self.evaluate_existential_risk(ent, phase, info1, info2)
+        }
@@ -1,23 +1,49 @@
 import numpy as np
-import tensorflow as tf
-from transformers import pipeline
-from sklearn.linear_model import LinearRegression
-import random
 import json
 import os
+import threading
 import pandas as pd
+from collections import deque
+from ai_ada_engine.nlp_batching import NLPBatcher
+from ai_ada_engine.state_store import StateStore
+from ai_ada_engine.donation_ledger import DonationLedger
+from ai_ada_engine.q_learning import DEFAULT_BINS, QLearningEngine, StateDiscretizer
+from ai_ada_engine.training_cache import ArtifactCache
+from instrumentation import timed
+
+# TensorFlow, transformers and scikit-learn are imported on first use so that
+# constructing an ADAEngine stays cheap for processes that never need them.
+LAZY_COMPONENTS = ('ml_model', 'nn_model', 'generator')
+
+# Only the most recent feedback is kept in memory; the journal has the rest
+FEEDBACK_TAIL = 1000
+
+# Inputs are rounded before prompting so nearby values share cached insights
+NLP_ROUND_DIGITS = 3
+
+# Every REPLAY_EVERY feedback events, one mini-batch is replayed from memory
+REPLAY_EVERY = 32
+
+# Defaults for train_nn_model; they are part of the artifact cache key
+NN_TRAINING = {'epochs': 100, 'batch_size': 256, 'patience': 5, 'validation_fraction': 0.2, 'seed': 42}
 
 class ADAEngine:
-    def __init__(self):
-        self.ml_model = LinearRegression()
-        self.nn_model = self.build_nn_model()
-        self.generator = pipeline('text-generation', model='gpt2')
+    def __init__(self, warm_up=False, state_dir="ada_state", state_bins=DEFAULT_BINS, n_actions=5):
+        self._ml_model = None
+        self._nn_model = None
+        self._generator = None
+        self._component_locks = {name: threading.Lock() for name in LAZY_COMPONENTS}
+        self.nlp_batcher = NLPBatcher(lambda: self.generator)
 
-        self.q_table = np.zeros((5, 5))
-        self.learning_rate = 0.1
-        self.discount_factor = 0.9
+        # States come from binned quantum features (see observe_quantum)
+        self.discretizer = StateDiscretizer(state_bins)
+        self.q_learning = QLearningEngine(self.discretizer.n_states, n_actions, learning_rate=0.1, discount_factor=0.9)
+        self.last_state = 0
+        self.last_action = None
+        # (state, action, reward) waiting for the state its action led to
+        self.pending_transition = None
 
-        self.feedback_data = []
+        self.feedback_data = deque(maxlen=FEEDBACK_TAIL)
         self.reward_threshold = 0.5
         self.improvement_counter = 0
 
@@ -36,9 +62,83 @@ class ADAEngine:
             "Minimize Existential Risk": 0.48
         }
 
+        self.state_store = StateStore(state_dir)
+        self.artifacts = ArtifactCache(os.path.join(state_dir, 'artifacts'))
         self.load_state()
+        self.ledger = DonationLedger(os.path.join(state_dir, 'donations.jsonl'))
+
+        if warm_up:
+            self.warm_up()
+
+    @property
+    def q_table(self):
+        return self.q_learning.q_table
+
+    @q_table.setter
+    def q_table(self, q_table):
+        if not self.q_learning.load_q_table(q_table):
+            print(f"[ADA] Ignoring saved Q-table of shape {np.shape(q_table)}; "
+                  f"the current state/action space is {self.q_learning.q_table.shape}")
+
+    def load_component(self, name):
+        with self._component_locks[name]:
+            if getattr(self, '_' + name) is None:
+                builder = getattr(self, 'build_' + name)
+                setattr(self, '_' + name, builder())
+        return getattr(self, '_' + name)
+
+    @property
+    def ml_model(self):
+        return self._ml_model if self._ml_model is not None else self.load_component('ml_model')
+
+    @ml_model.setter
+    def ml_model(self, model):
+        self._ml_model = model
+
+    @property
+    def nn_model(self):
+        return self._nn_model if self._nn_model is not None else self.load_component('nn_model')
+
+    @nn_model.setter
+    def nn_model(self, model):
+        self._nn_model = model
+
+    @property
+    def generator(self):
+        return self._generator if self._generator is not None else self.load_component('generator')
+
+    @generator.setter
+    def generator(self, generator):
+        self._generator = generator
+
+    def warm_up(self, components=LAZY_COMPONENTS, background=True):
+        # Load heavy components ahead of the first request that needs them
+        def load_all():
+            for name in components:
+                self.load_component(name)
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name="ada-warm-up", daemon=True)
+        thread.start()
+        return thread
+
+    def build_ml_model(self):
+        from sklearn.linear_model import LinearRegression
+        return LinearRegression()
+
+    def build_generator(self):
+        from transformers import pipeline
+        generator = pipeline('text-generation', model='gpt2')
+        # GPT-2 has no pad token; batched prompts need one, padded on the
+        # left so generation continues right after each prompt
+        generator.tokenizer.pad_token = generator.tokenizer.eos_token
+        generator.tokenizer.padding_side = "left"
+        return generator
 
     def build_nn_model(self):
+        import tensorflow as tf
         model = tf.keras.Sequential([
             tf.keras.layers.Dense(64, input_dim=2, activation='relu'),
             tf.keras.layers.Dense(64, activation='relu'),
@@ -47,32 +147,132 @@ class ADAEngine:
         model.compile(optimizer='adam', loss='mse')
         return model
 
-    def train_ml_model(self, quantum_data):
+    def features_and_targets(self, quantum_data):
+        # Accepts get_all_data-style dicts or an iter_batches column batch
+        if isinstance(quantum_data, dict):
+            X = np.column_stack([quantum_data['entanglement_density'], quantum_data['phase_alignment']])
+            y = np.asarray(quantum_data['info_flow_1'], dtype=float)
+            return X, y
         X = [[data['entanglement_density'], data['phase_alignment']] for data in quantum_data]
         y = [data['information_flow'][0] for data in quantum_data]
+        return X, y
+
+    def training_arrays(self, quantum_data, dtype=np.float64):
+        X, y = self.features_and_targets(quantum_data)
+        return np.asarray(X, dtype=dtype), np.asarray(y, dtype=dtype)
+
+    def train_ml_model(self, quantum_data):
+        """
+        Fit, or load the coefficients from a previous fit on identical data.
+        Returns True if the model was actually trained.
+        """
+        X, y = self.training_arrays(quantum_data)
+        key = self.artifacts.key('ml', [X, y], {'model': 'LinearRegression'})
+        cached = self.artifacts.load(key)
+        if cached is not None:
+            self.ml_model.coef_, self.ml_model.intercept_ = cached[0], cached[1].item()
+            self.ml_model.n_features_in_ = X.shape[1]
+            return False
         self.ml_model.fit(X, y)
+        self.artifacts.save(key, [self.ml_model.coef_, np.asarray(self.ml_model.intercept_)])
+        return True
+
+    def train_ml_model_stream(self, batches):
+        # Least squares from accumulated normal equations, so memory stays
+        # constant no matter how many rows the batches cover
+        xtx = np.zeros((3, 3))
+        xty = np.zeros(3)
+        rows = 0
+        for batch in batches:
+            X, y = self.features_and_targets(batch)
+            X = np.column_stack([np.ones(len(y)), X])
+            xtx += X.T @ X
+            xty += X.T @ np.asarray(y, dtype=float)
+            rows += len(y)
+        if rows == 0:
+            raise ValueError("train_ml_model_stream received no training rows")
+        solution = np.linalg.lstsq(xtx, xty, rcond=None)[0]
+        self.ml_model.intercept_ = solution[0]
+        self.ml_model.coef_ = solution[1:]
+        self.ml_model.n_features_in_ = 2
 
     def analyze_with_ml(self, quantum_data):
         features = [quantum_data['entanglement_density'], quantum_data['phase_alignment']]
         prediction = self.ml_model.predict([features])
         return {'ml_prediction': prediction[0]}
 
-    def train_nn_model(self, quantum_data):
-        X = [[data['entanglement_density'], data['phase_alignment']] for data in quantum_data]
-        y = [data['information_flow'][0] for data in quantum_data]
-        self.nn_model.fit(X, y, epochs=100, batch_size=10)
+    def train_nn_model(self, quantum_data, **params):
+        """
+        Train with tf.data batches and early stopping on a held-out split, or
+        load the weights from a previous run with the same data and params.
+        Returns True if the model was actually trained.
+        """
+        params = dict(NN_TRAINING, **params)
+        X, y = self.training_arrays(quantum_data, dtype=np.float32)
+        key = self.artifacts.key('nn', [X, y], params)
+        cached = self.artifacts.load(key)
+        if cached is not None:
+            self.nn_model.set_weights(cached)
+            return False
+
+        import tensorflow as tf
+        order = np.random.default_rng(params['seed']).permutation(len(y))
+        n_val = int(len(y) * params['validation_fraction'])
+        val, train = order[:n_val], order[n_val:]
+        train_ds = tf.data.Dataset.from_tensor_slices((X[train], y[train])) \
+            .shuffle(len(train), seed=params['seed']).batch(params['batch_size']).prefetch(tf.data.AUTOTUNE)
+        val_ds = None
+        if n_val:
+            val_ds = tf.data.Dataset.from_tensor_slices((X[val], y[val])).batch(params['batch_size'])
+        early_stopping = tf.keras.callbacks.EarlyStopping(
+            monitor='val_loss' if n_val else 'loss', patience=params['patience'], restore_best_weights=True)
+        self.nn_model.fit(train_ds, validation_data=val_ds, epochs=params['epochs'],
+                          callbacks=[early_stopping], verbose=0)
+        self.artifacts.save(key, self.nn_model.get_weights())
+        return True
+
+    def train_from_loader(self, loader):
+        # Trains straight from the loader's validated columns (no row dicts)
+        columns = loader.columns
+        return {'ml': self.train_ml_model(columns), 'nn': self.train_nn_model(columns)}
+
+    def train_nn_model_stream(self, batches, batch_size=10):
+        for batch in batches:
+            X, y = self.features_and_targets(batch)
+            self.nn_model.fit(np.asarray(X), np.asarray(y), epochs=1, batch_size=batch_size, verbose=0)
 
     def analyze_with_nn(self, quantum_data):
         features = [quantum_data['entanglement_density'], quantum_data['phase_alignment']]
         prediction = self.nn_model.predict([features])
         return {'nn_prediction': prediction[0][0]}
 
-    def analyze_with_nlp(self, quantum_data):
-        text_input = f"Given entanglement_density {quantum_data['entanglement_density']} and phase_alignment {quantum_data['phase_alignment']}, infer the scenario: {self.current_scenario}."
-        response = self.generator(text_input, max_length=50, num_return_sequences=1)
-        return {'nlp_insight': response[0]['generated_text']}
+    @timed("nlp")
+    def analyze_with_nlp(self, quantum_data, use_cache=True, max_length=50, **generation_params):
+        # Concurrent calls are micro-batched; pass use_cache=False when fresh
+        # (e.g. sampled) output is wanted for repeated inputs
+        ent = round(float(quantum_data['entanglement_density']), NLP_ROUND_DIGITS)
+        phase = round(float(quantum_data['phase_alignment']), NLP_ROUND_DIGITS)
+        text_input = f"Given entanglement_density {ent} and phase_alignment {phase}, infer the scenario: {self.current_scenario}."
+        insight = self.nlp_batcher.generate(
+            text_input,
+            cache_key=(self.current_scenario, ent, phase),
+            use_cache=use_cache,
+            max_length=max_length,
+            num_return_sequences=1,
+            **generation_params
+        )
+        return {'nlp_insight': insight}
+
+    def observe_quantum(self, quantum_data):
+        # The state and chosen action are what the next feedback rewards
+        state = self.discretizer.state(quantum_data)
+        self.complete_transition(state)
+        self.last_state = state
+        self.last_action = self.q_learning.select_action(self.last_state)
+        return self.last_state, self.last_action
 
     def analyze_with_goals(self, quantum_data):
+        self.observe_quantum(quantum_data)
         ent = quantum_data['entanglement_density']
         phase = quantum_data['phase_alignment']
         info1, info2 = quantum_data['information_flow']
@@ -106,15 +306,63 @@ class ADAEngine:
         self.feedback_data.append(feedback)
         self.improvement_counter += 1
         reward = 1 if "positive" in feedback else -1
-        self.update_q_table(reward)
-        self.save_state()
+        state, action = self.update_q_table(reward)
+        # O(1) journal append; the Q-table is only rewritten on snapshots
+        self.state_store.append({
+            'feedback': feedback,
+            'reward': reward,
+            'state': state,
+            'action': action,
+            'scenario': self.current_scenario
+        })
+        if self.improvement_counter % REPLAY_EVERY == 0:
+            self.q_learning.replay()
+        if self.state_store.should_snapshot():
+            self.save_state()
+
+    def update_q_table(self, reward, state=None, action=None, journal=True):
+        """
+        Rewards the action taken in `state`. The Q-update waits until the
+        next observed state is known (see complete_transition); feedback
+        arriving before a new observation completes the previous transition
+        with the current state.
+        """
+        state = self.last_state if state is None else state
+        if action is None:
+            action = self.last_action if self.last_action is not None else self.q_learning.select_action(state)
+        self.complete_transition(state, journal)
+        self.pending_transition = (state, action, reward)
+        return state, action
+
+    def complete_transition(self, next_state, journal=True):
+        if self.pending_transition is None:
+            return
+        state, action, reward = self.pending_transition
+        self.pending_transition = None
+        self.apply_transition(state, action, reward, next_state)
+        if journal:
+            # Replay applies exactly this transition, whatever was observed
+            # between the feedback and now
+            self.state_store.append({'state': state, 'action': action, 'reward': reward, 'next_state': next_state})
+
+    def apply_transition(self, state, action, reward, next_state):
+        self.q_learning.update(state, action, reward, next_state)
+        self.q_learning.observe(state, action, reward, next_state)
 
-    def update_q_table(self, reward):
-        state = random.randint(0, 4)
-        action = random.randint(0, 4)
-        best_next_action = np.argmax(self.q_table[state])
-        self.q_table[state, action] = (1 - self.learning_rate) * self.q_table[state, action] + \
-            self.learning_rate * (reward + self.discount_factor * self.q_table[state, best_next_action])
+    def in_q_table(self, *cells):
+        # cells: states followed by an action, e.g. (state, next_state, action)
+        n_states, n_actions = self.q_table.shape
+        return all(state < n_states for state in cells[:-1]) and cells[-1] < n_actions
+
+    def add_donation(self, donor_name, amount, source='paypal'):
+        self.ledger.record(donor_name, amount, source)
+
+    def add_donations(self, donations):
+        # donations: iterable of (donor_name, amount, source)
+        self.ledger.record_many(donations)
+
+    def update_donations(self, donor_name, amount_donated):
+        self.add_donation(donor_name, amount_donated)
 
     def run_simulation(self):
         # Replace this simulation with real data or process
@@ -132,19 +380,44 @@ class ADAEngine:
         return pd.DataFrame(donor_data)
 
     def save_state(self):
-        with open("ada_state.json", "w") as f:
-            json.dump({
-                'q_table': self.q_table.tolist(),
-                'feedback_data': self.feedback_data,
-                'improvement_counter': self.improvement_counter,
-                'scenario': self.current_scenario
-            }, f)
+        # The pending transition is not in the Q-table yet; its completion is
+        # journaled after the snapshot, so it is carried over in the metadata
+        self.state_store.snapshot(self.q_table, {
+            'improvement_counter': self.improvement_counter,
+            'scenario': self.current_scenario,
+            'pending_transition': self.pending_transition
+        })
 
     def load_state(self):
-        if os.path.exists("ada_state.json"):
+        meta, q_table, tail = self.state_store.load()
+        if meta is not None:
+            self.q_table = q_table
+            self.improvement_counter = meta['improvement_counter']
+            self.current_scenario = meta['scenario']
+            pending = meta.get('pending_transition')
+            if pending is not None and self.in_q_table(pending[0], pending[1]):
+                self.pending_transition = tuple(pending)
+        elif os.path.exists("ada_state.json"):
+            # Legacy whole-state file from before the journal existed
             with open("ada_state.json", "r") as f:
                 state = json.load(f)
                 self.q_table = np.array(state['q_table'])
-                self.feedback_data = state['feedback_data']
+                self.feedback_data.extend(state['feedback_data'])
                 self.improvement_counter = state['improvement_counter']
                 self.current_scenario = state['scenario']
+
+        # Replay only the records written after the snapshot: completed
+        # transitions are applied as journaled, and feedback leaves its
+        # transition pending just as it did live. Records from a larger
+        # state/action space than the current one are skipped.
+        for record in tail:
+            if 'next_state' in record:
+                if self.in_q_table(record['state'], record['next_state'], record['action']):
+                    self.apply_transition(record['state'], record['action'], record['reward'], record['next_state'])
+                self.pending_transition = None
+                continue
+            if self.in_q_table(record['state'], record['action']):
+                self.update_q_table(record['reward'], record['state'], record['action'], journal=False)
+            self.feedback_data.append(record['feedback'])
+            self.improvement_counter += 1
+            self.current_scenario = record['scenario']
@@ -0,0 +1,58 @@
+import struct
+import numpy as np
+
+TREE_LEAF = -1
+
+class CompiledTree:
+    """
+    Flat-array export of a fitted single-output DecisionTreeRegressor.
+
+    predict_one walks plain Python lists, avoiding sklearn's per-call input
+    validation; predict walks a whole batch one tree level at a time with
+    NumPy. Like sklearn, inputs are rounded to float32 before being compared
+    with the (float64) thresholds, so predictions are identical. Inputs are
+    assumed to contain no NaNs.
+    """
+    def __init__(self, children_left, children_right, feature, threshold, value, max_depth, n_features):
+        self.children_left = np.asarray(children_left, dtype=np.int64)
+        self.children_right = np.asarray(children_right, dtype=np.int64)
+        # Leaves have feature -2; any valid column works since they never branch
+        self.feature = np.maximum(np.asarray(feature, dtype=np.int64), 0)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.max_depth = max_depth
+        self.n_features = n_features
+        self.is_leaf = self.children_left == TREE_LEAF
+
+        self.nodes = list(zip(self.children_left.tolist(), self.children_right.tolist(),
+                              self.feature.tolist(), self.threshold.tolist()))
+        self.values = self.value.tolist()
+        self.float32_format = f'{n_features}f'
+
+    @classmethod
+    def from_estimator(cls, model):
+        tree = model.tree_
+        return cls(tree.children_left, tree.children_right, tree.feature, tree.threshold,
+                   tree.value[:, 0, 0], tree.max_depth, tree.n_features)
+
+    def predict_one(self, row):
+        # Round-trip through float32, matching sklearn's input conversion
+        fmt = self.float32_format
+        x = struct.unpack(fmt, struct.pack(fmt, *row))
+        nodes = self.nodes
+        node = 0
+        left, right, feature, threshold = nodes[0]
+        while left != TREE_LEAF:
+            node = left if x[feature] <= threshold else right
+            left, right, feature, threshold = nodes[node]
+        return self.values[node]
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))
+        nodes = np.zeros(len(X), dtype=np.int64)
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(self.is_leaf[nodes], nodes,
+                             np.where(go_left, self.children_left[nodes], self.children_right[nodes]))
+        return self.value[nodes]
@@ -0,0 +1,118 @@
+import heapq
+import json
+import math
+import os
+import threading
+import time
+from ai_ada_engine.state_store import read_journal
+
+def parse_amount(amount):
+    """
+    Returns amount as a float, raising ValueError unless it is a finite,
+    positive number; a NaN or infinity would poison the running totals.
+    """
+    value = float(amount)
+    if not (math.isfinite(value) and value > 0):
+        raise ValueError(f"invalid donation amount: {amount!r}")
+    return value
+
+class DonationLedger:
+    """
+    Running donation totals per donor, per source and per time bucket.
+
+    Each donation updates the totals in O(1) and is appended as one JSON
+    line to the journal; on startup the journal is replayed to rebuild the
+    totals. journal_path=None keeps the ledger in memory only, e.g. for
+    simulated campaigns.
+    """
+    def __init__(self, journal_path='ada_state/donations.jsonl', bucket_seconds=3600):
+        self.journal_path = journal_path
+        self.bucket_seconds = bucket_seconds
+        self.lock = threading.Lock()
+        self.journal = None
+        self.total = 0.0
+        self.count = 0
+        self.by_donor = {}
+        self.by_source = {}
+        self.by_bucket = {}
+        if journal_path is not None:
+            directory = os.path.dirname(journal_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.replay()
+
+    def apply(self, timestamp, donor, amount, source):
+        self.total += amount
+        self.count += 1
+        self.by_donor[donor] = self.by_donor.get(donor, 0.0) + amount
+        self.by_source[source] = self.by_source.get(source, 0.0) + amount
+        bucket = int(timestamp // self.bucket_seconds) * self.bucket_seconds
+        self.by_bucket[bucket] = self.by_bucket.get(bucket, 0.0) + amount
+
+    def replay(self):
+        if not os.path.exists(self.journal_path):
+            return
+        for entry in read_journal(self.journal_path):
+            try:
+                amount = parse_amount(entry['amount'])
+            except (TypeError, ValueError):
+                # Written before amounts were validated; keep it out of the totals
+                print(f"[Ledger] Skipping journal entry with invalid amount {entry['amount']!r}")
+                continue
+            self.apply(entry['ts'], entry['donor'], amount, entry['source'])
+
+    def record(self, donor, amount, source='paypal', timestamp=None):
+        self.record_many([(donor, amount, source)], timestamp)
+
+    def record_many(self, donations, timestamp=None):
+        """
+        donations is an iterable of (donor, amount, source); the batch is
+        written to the journal with a single write.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        # Validate every amount first so a bad one rejects the whole batch
+        # before the totals or the journal change
+        donations = [(donor, parse_amount(amount), source) for donor, amount, source in donations]
+        with self.lock:
+            lines = []
+            for donor, amount, source in donations:
+                self.apply(timestamp, donor, amount, source)
+                if self.journal_path is not None:
+                    lines.append(json.dumps({'ts': timestamp, 'donor': donor, 'amount': amount, 'source': source}))
+            if lines:
+                if self.journal is None:
+                    self.journal = open(self.journal_path, 'a', encoding='utf-8')
+                self.journal.write('\n'.join(lines) + '\n')
+                self.journal.flush()
+
+    def donor_total(self, donor):
+        return self.by_donor.get(donor, 0.0)
+
+    def source_total(self, source):
+        return self.by_source.get(source, 0.0)
+
+    def totals_since(self, since):
+        # Sum of the buckets starting at or after `since`
+        with self.lock:
+            return sum(amount for bucket, amount in self.by_bucket.items() if bucket >= since)
+
+    def top_donors(self, n=10):
+        with self.lock:
+            return heapq.nlargest(n, self.by_donor.items(), key=lambda item: item[1])
+
+    def summary(self, top=10):
+        with self.lock:
+            summary = {
+                'total': self.total,
+                'count': self.count,
+                'by_source': dict(self.by_source),
+                'recent_buckets': {str(bucket): amount for bucket, amount in sorted(self.by_bucket.items())[-24:]}
+            }
+        summary['top_donors'] = self.top_donors(top)
+        return summary
+
+    def close(self):
+        with self.lock:
+            if self.journal is not None:
+                self.journal.close()
+                self.journal = None
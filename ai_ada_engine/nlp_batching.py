@@ -0,0 +1,152 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError
+
+class NLPBatcher:
+    """
+    Collects concurrent text-generation requests for up to window_ms and runs
+    them as one batched pipeline call, with an LRU cache of finished results.
+
+    generator_provider is a callable returning the transformers pipeline, so
+    the model is still only loaded when the first request arrives.
+    """
+    def __init__(self, generator_provider, window_ms=5, max_batch=16, cache_size=1024, timeout=120):
+        self.generator_provider = generator_provider
+        self.timeout = timeout
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.requests = queue.Queue()
+        self.worker = None
+        self.metrics = {
+            'requests': 0, 'cache_hits': 0, 'cache_misses': 0, 'batches': 0,
+            'batched_prompts': 0, 'generated_tokens': 0, 'generation_seconds': 0.0
+        }
+
+    def generate(self, prompt, cache_key=None, use_cache=True, timeout=None, **params):
+        """
+        Blocking generate for one prompt; returns the generated text. Raises
+        concurrent.futures.TimeoutError after `timeout` seconds (default
+        self.timeout) instead of waiting forever on a stuck worker.
+        """
+        future = self.submit(prompt, cache_key, use_cache, **params)
+        try:
+            return future.result(timeout=self.timeout if timeout is None else timeout)
+        except TimeoutError:
+            # Don't hand the stuck future to later identical requests
+            with self.lock:
+                for key, pending in list(self.pending.items()):
+                    if pending is future:
+                        del self.pending[key]
+            raise
+
+    def submit(self, prompt, cache_key=None, use_cache=True, **params):
+        params_key = tuple(sorted(params.items()))
+        key = (cache_key if cache_key is not None else prompt, params_key)
+        with self.lock:
+            self.metrics['requests'] += 1
+            if use_cache:
+                if key in self.cache:
+                    self.cache.move_to_end(key)
+                    self.metrics['cache_hits'] += 1
+                    future = Future()
+                    future.set_result(self.cache[key])
+                    return future
+                # Identical request already in flight: share its result
+                if key in self.pending:
+                    self.metrics['cache_hits'] += 1
+                    return self.pending[key]
+                self.metrics['cache_misses'] += 1
+            future = Future()
+            if use_cache:
+                self.pending[key] = future
+            self.ensure_worker()
+        self.requests.put((prompt, key if use_cache else None, params, future))
+        return future
+
+    def ensure_worker(self):
+        if self.worker is None or not self.worker.is_alive():
+            self.worker = threading.Thread(target=self.worker_loop, name="nlp-batcher", daemon=True)
+            self.worker.start()
+
+    def worker_loop(self):
+        while True:
+            batch = [self.requests.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            # Only requests with identical generation params can share a call
+            groups = {}
+            for item in batch:
+                groups.setdefault(tuple(sorted(item[2].items())), []).append(item)
+            for items in groups.values():
+                self.run_group(items)
+
+    def run_group(self, items):
+        prompts = [item[0] for item in items]
+        params = dict(items[0][2])
+        try:
+            generator = self.generator_provider()
+            tokenizer = getattr(generator, 'tokenizer', None)
+            if tokenizer is not None and len(prompts) > 1:
+                params.setdefault('pad_token_id', tokenizer.eos_token_id)
+                params.setdefault('batch_size', len(prompts))
+            start = time.perf_counter()
+            outputs = generator(prompts, **params)
+            elapsed = time.perf_counter() - start
+            texts = [(out[0] if isinstance(out, list) else out)['generated_text'] for out in outputs]
+            tokens = sum(self.count_tokens(tokenizer, text) - self.count_tokens(tokenizer, prompt)
+                         for prompt, text in zip(prompts, texts))
+        except Exception as e:
+            with self.lock:
+                for _, key, _, future in items:
+                    self.pending.pop(key, None)
+                    future.set_exception(e)
+            return
+
+        with self.lock:
+            self.metrics['batches'] += 1
+            self.metrics['batched_prompts'] += len(prompts)
+            self.metrics['generated_tokens'] += max(tokens, 0)
+            self.metrics['generation_seconds'] += elapsed
+            for (_, key, _, future), text in zip(items, texts):
+                if key is not None:
+                    self.pending.pop(key, None)
+                    self.cache[key] = text
+                    self.cache.move_to_end(key)
+                    if len(self.cache) > self.cache_size:
+                        self.cache.popitem(last=False)
+                future.set_result(text)
+
+    @staticmethod
+    def count_tokens(tokenizer, text):
+        if tokenizer is None:
+            return len(text.split())
+        return len(tokenizer.encode(text))
+
+    def stats(self):
+        with self.lock:
+            stats = dict(self.metrics)
+            stats['cache_size'] = len(self.cache)
+        lookups = stats['cache_hits'] + stats['cache_misses']
+        stats['cache_hit_rate'] = stats['cache_hits'] / lookups if lookups else 0.0
+        stats['tokens_per_second'] = (stats['generated_tokens'] / stats['generation_seconds']
+                                      if stats['generation_seconds'] else 0.0)
+        stats['mean_batch_size'] = stats['batched_prompts'] / stats['batches'] if stats['batches'] else 0.0
+        return stats
+
+    def clear_cache(self):
+        with self.lock:
+            self.cache.clear()
@@ -0,0 +1,163 @@
+import numpy as np
+
+# (low, high) per feature: entanglement_density, phase_alignment and the
+# absolute difference between the two information flows
+DEFAULT_FEATURE_RANGES = ((0.0, 1.0), (0.0, 1.0), (0.0, 50.0))
+DEFAULT_BINS = (10, 10, 10)
+
+class StateDiscretizer:
+    """
+    Maps quantum features to a state index by binning each feature into
+    equal-width bins over its range; values outside the range fall into the
+    edge bins. n_states is the product of the bin counts.
+    """
+    def __init__(self, bins=DEFAULT_BINS, ranges=DEFAULT_FEATURE_RANGES):
+        self.bins = np.asarray(bins, dtype=np.int64)
+        ranges = np.asarray(ranges, dtype=float)
+        self.low = ranges[:, 0]
+        self.width = ranges[:, 1] - ranges[:, 0]
+        self.n_states = int(np.prod(self.bins))
+
+    @staticmethod
+    def features(quantum_output):
+        info1, info2 = quantum_output['information_flow']
+        return (quantum_output['entanglement_density'], quantum_output['phase_alignment'], abs(info1 - info2))
+
+    def transform(self, features):
+        # features: array of shape (n, 3) -> int64 state indices of shape (n,)
+        features = np.asarray(features, dtype=float)
+        cells = ((features - self.low) / self.width * self.bins).astype(np.int64)
+        np.clip(cells, 0, self.bins - 1, out=cells)
+        return np.ravel_multi_index(cells.T, self.bins)
+
+    def state(self, quantum_output):
+        return int(self.transform([self.features(quantum_output)])[0])
+
+class ReplayMemory:
+    """
+    Fixed-capacity ring buffer of transitions in preallocated arrays; once
+    full, the oldest transitions are overwritten.
+    """
+    def __init__(self, capacity=100_000):
+        self.capacity = capacity
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float64)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.position = 0
+        self.size = 0
+
+    def push(self, state, action, reward, next_state, done=False):
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def push_batch(self, states, actions, rewards, next_states, dones=False):
+        states = np.asarray(states)
+        n = len(states)
+        if n > self.capacity:
+            # Only the newest `capacity` transitions would survive anyway
+            keep = slice(n - self.capacity, n)
+            states, actions, rewards, next_states = (states[keep], np.asarray(actions)[keep],
+                                                     np.asarray(rewards)[keep], np.asarray(next_states)[keep])
+            dones = dones if np.isscalar(dones) else np.asarray(dones)[keep]
+            n = self.capacity
+        idx = (self.position + np.arange(n)) % self.capacity
+        self.states[idx] = states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.next_states[idx] = next_states
+        self.dones[idx] = dones
+        self.position = (self.position + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    def sample(self, batch_size, rng):
+        idx = rng.integers(0, self.size, batch_size)
+        return self.states[idx], self.actions[idx], self.rewards[idx], self.next_states[idx], self.dones[idx]
+
+    def __len__(self):
+        return self.size
+
+class QLearningEngine:
+    """
+    Tabular Q-learning with experience replay. Updates are applied to whole
+    mini-batches at once; transitions that share a (state, action) cell are
+    averaged into a single step, since their TD errors all come from the same
+    old Q value.
+    """
+    def __init__(self, n_states, n_actions=5, learning_rate=0.1, discount_factor=0.9, epsilon=0.1,
+                 batch_size=256, memory_size=100_000, dtype=np.float32, seed=None):
+        self.n_states = n_states
+        self.n_actions = n_actions
+        self.learning_rate = learning_rate
+        self.discount_factor = discount_factor
+        self.epsilon = epsilon
+        self.batch_size = batch_size
+        self.q_table = np.zeros((n_states, n_actions), dtype=dtype)
+        self.memory = ReplayMemory(memory_size)
+        self.rng = np.random.default_rng(seed)
+
+    def select_action(self, state):
+        # Epsilon-greedy
+        if self.rng.random() < self.epsilon:
+            return int(self.rng.integers(self.n_actions))
+        return int(np.argmax(self.q_table[state]))
+
+    def select_actions(self, states):
+        states = np.asarray(states)
+        actions = np.argmax(self.q_table[states], axis=1)
+        explore = self.rng.random(len(states)) < self.epsilon
+        actions[explore] = self.rng.integers(self.n_actions, size=int(explore.sum()))
+        return actions
+
+    def update_batch(self, states, actions, rewards, next_states, dones=False):
+        states = np.asarray(states)
+        actions = np.asarray(actions)
+        targets = np.asarray(rewards, dtype=np.float64) + \
+            self.discount_factor * self.q_table[next_states].max(axis=1) * (1 - np.asarray(dones, dtype=np.float64))
+        td_errors = targets - self.q_table[states, actions]
+        cells, inverse = np.unique(states * self.n_actions + actions, return_inverse=True)
+        mean_td = np.bincount(inverse, weights=td_errors) / np.bincount(inverse)
+        self.q_table[cells // self.n_actions, cells % self.n_actions] += self.learning_rate * mean_td
+        return td_errors
+
+    def update(self, state, action, reward, next_state, done=False):
+        # Single transition: plain scalar arithmetic beats numpy dispatch here
+        q = self.q_table
+        target = reward if done else reward + self.discount_factor * q[next_state].max()
+        q[state, action] += self.learning_rate * (target - q[state, action])
+
+    def observe(self, state, action, reward, next_state, done=False):
+        self.memory.push(state, action, reward, next_state, done)
+
+    def observe_batch(self, states, actions, rewards, next_states, dones=False):
+        self.memory.push_batch(states, actions, rewards, next_states, dones)
+
+    def replay(self, batches=1):
+        """
+        Apply `batches` mini-batch updates sampled from the replay memory.
+        Returns the mean absolute TD error of the last batch.
+        """
+        if len(self.memory) == 0:
+            return 0.0
+        td_errors = np.zeros(1)
+        for _ in range(batches):
+            td_errors = self.update_batch(*self.memory.sample(self.batch_size, self.rng))
+        return float(np.abs(td_errors).mean())
+
+    def load_q_table(self, q_table):
+        """
+        Adopt a saved table if its shape matches; returns False (keeping the
+        current table) for tables saved with a different state/action space.
+        """
+        q_table = np.asarray(q_table)
+        if q_table.shape != self.q_table.shape:
+            return False
+        self.q_table = q_table.astype(self.q_table.dtype)
+        return True
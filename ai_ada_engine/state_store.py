@@ -0,0 +1,121 @@
+import glob
+import json
+import os
+import numpy as np
+
+def read_journal(path):
+    """
+    Return the JSON records of a line-per-record journal. Undecodable lines
+    are skipped, and an unterminated final line (torn by a crash mid-append)
+    is truncated away so the next append starts on a fresh line.
+    """
+    records = []
+    skipped = 0
+    with open(path, 'rb+') as f:
+        good_end = 0
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            good_end += len(line)
+            try:
+                records.append(json.loads(line))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                skipped += 1
+        f.seek(0, os.SEEK_END)
+        if f.tell() != good_end:
+            f.truncate(good_end)
+            skipped += 1
+    if skipped:
+        print(f"[Journal] Skipped {skipped} damaged line(s) in {path}")
+    return records
+
+class StateStore:
+    """
+    Append-only feedback journal plus periodic atomic Q-table snapshots.
+
+    Every feedback event and every completed Q-learning transition is one
+    JSON line in feedback.jsonl. Every snapshot_every records the Q-table is
+    written to q_table-<seq>.npy and snapshot.json is atomically replaced to
+    point at it; the journal is then rotated, so startup only replays
+    records newer than the snapshot.
+    """
+    def __init__(self, directory='ada_state', snapshot_every=100):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.journal_path = os.path.join(directory, 'feedback.jsonl')
+        self.meta_path = os.path.join(directory, 'snapshot.json')
+        self.seq = 0
+        self.events_since_snapshot = 0
+        self.journal = None
+        os.makedirs(directory, exist_ok=True)
+
+    def load(self):
+        """
+        Return (meta, q_table, journal_tail). meta and q_table are None when
+        no snapshot exists; journal_tail lists records newer than the snapshot.
+        """
+        meta, q_table = None, None
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r') as f:
+                meta = json.load(f)
+            q_table = np.load(os.path.join(self.directory, meta['q_table_file']))
+            self.seq = meta['seq']
+
+        tail = []
+        if os.path.exists(self.journal_path):
+            tail = [record for record in read_journal(self.journal_path) if record['seq'] > self.seq]
+        if tail:
+            self.seq = tail[-1]['seq']
+        self.events_since_snapshot = len(tail)
+        return meta, q_table, tail
+
+    def append(self, record):
+        if self.journal is None:
+            self.journal = open(self.journal_path, 'a', encoding='utf-8')
+        self.seq += 1
+        record = dict(record, seq=self.seq)
+        self.journal.write(json.dumps(record) + '\n')
+        self.journal.flush()
+        self.events_since_snapshot += 1
+        return record
+
+    def should_snapshot(self):
+        return self.events_since_snapshot >= self.snapshot_every
+
+    def snapshot(self, q_table, meta):
+        q_table_file = f'q_table-{self.seq}.npy'
+        tmp_path = os.path.join(self.directory, q_table_file + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            np.save(f, q_table)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, os.path.join(self.directory, q_table_file))
+
+        meta = dict(meta, seq=self.seq, q_table_file=q_table_file)
+        tmp_path = self.meta_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.meta_path)
+
+        # Journal entries up to seq are now covered by the snapshot
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        rotated = f'feedback-{self.seq}.jsonl'
+        if os.path.exists(self.journal_path):
+            os.replace(self.journal_path, os.path.join(self.directory, rotated))
+        # Keep only the most recent rotated journal
+        for old in glob.glob(os.path.join(self.directory, 'feedback-*.jsonl')):
+            if os.path.basename(old) != rotated:
+                os.remove(old)
+        for old in glob.glob(os.path.join(self.directory, 'q_table-*.npy')):
+            if os.path.basename(old) != q_table_file:
+                os.remove(old)
+        self.events_since_snapshot = 0
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
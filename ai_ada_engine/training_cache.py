@@ -0,0 +1,47 @@
+import hashlib
+import json
+import os
+import numpy as np
+
+# Bump whenever model architecture or training code changes, so artifacts
+# trained by older code are not reused
+CODE_VERSION = "1"
+
+class ArtifactCache:
+    """
+    Trained model weights stored as .npz files, keyed by a SHA-256 of the
+    training data, the hyperparameters and CODE_VERSION. A cache hit means
+    the same inputs were already trained on, so the weights can be loaded
+    instead of retraining.
+    """
+    def __init__(self, directory='ada_state/artifacts'):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, kind, arrays, params):
+        digest = hashlib.sha256()
+        digest.update(f"{kind}|{CODE_VERSION}|{json.dumps(params, sort_keys=True)}".encode('utf-8'))
+        for array in arrays:
+            array = np.ascontiguousarray(array)
+            digest.update(f"|{array.dtype.str}{array.shape}|".encode('utf-8'))
+            digest.update(array.data)
+        return f"{kind}-{digest.hexdigest()}"
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+    def load(self, key):
+        """
+        Returns the saved arrays in their original order, or None on a miss.
+        """
+        path = self.path(key)
+        if not os.path.exists(path):
+            return None
+        with np.load(path) as saved:
+            return [saved[f'arr_{i}'] for i in range(len(saved.files))]
+
+    def save(self, key, arrays):
+        tmp_path = self.path(key) + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, *arrays)
+        os.replace(tmp_path, self.path(key))
@@ -0,0 +1,45 @@
+# compare.py – flag benchmark regressions between two suite.py result files
+#
+#   python benchmarks/compare.py baseline.json current.json --threshold 0.10
+#
+# Exits with status 1 when any benchmark's median got slower than the
+# threshold allows, so it can gate CI.
+
+import argparse
+import json
+import sys
+
+def compare(baseline, current, threshold):
+    rows = []
+    for key, base in baseline['results'].items():
+        new = current['results'].get(key)
+        if new is None or 'skipped' in base or 'skipped' in new:
+            continue
+        ratio = new['median_s'] / base['median_s']
+        if ratio > 1 + threshold:
+            status = "REGRESSION"
+        elif ratio < 1 - threshold:
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append((key, base['median_s'], new['median_s'], ratio, status))
+    return rows
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed relative slowdown (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.threshold)
+    for key, base, new, ratio, status in rows:
+        print(f"{key:48s} {base * 1e3:10.4f} ms -> {new * 1e3:10.4f} ms   x{ratio:5.2f}   {status}")
+    regressions = [row for row in rows if row[4] == "REGRESSION"]
+    print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%} across {len(rows)} benchmark(s)")
+    sys.exit(1 if regressions else 0)
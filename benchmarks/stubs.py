@@ -0,0 +1,125 @@
+# stubs.py – offline stand-ins for GPT-2, TensorFlow and pyttsx3
+#
+# install() registers lightweight fake modules in sys.modules so benchmarks
+# measure this project's code rather than model downloads or audio output.
+# Call it before importing anything from the project.
+
+import sys
+import types
+import numpy as np
+
+class FakeTokenizer:
+    eos_token = "<|endoftext|>"
+    eos_token_id = 50256
+
+    def encode(self, text):
+        return text.split()
+
+class FakeTextGenerator:
+    """
+    Mimics a transformers text-generation pipeline: appends a fixed
+    continuation to each prompt.
+    """
+    def __init__(self, continuation=" The scenario converges toward stability."):
+        self.continuation = continuation
+        self.tokenizer = FakeTokenizer()
+
+    def __call__(self, prompts, **params):
+        if isinstance(prompts, str):
+            return [{'generated_text': prompts + self.continuation}]
+        return [[{'generated_text': prompt + self.continuation}] for prompt in prompts]
+
+def fake_pipeline(task, model=None, **kwargs):
+    return FakeTextGenerator()
+
+class FakeDense:
+    def __init__(self, units, input_dim=None, activation=None):
+        self.units = units
+        self.input_dim = input_dim
+
+class FakeDataset:
+    """
+    tf.data.Dataset stand-in; keeps the full arrays and ignores batching.
+    """
+    def __init__(self, tensors):
+        self.tensors = tensors
+
+    @classmethod
+    def from_tensor_slices(cls, tensors):
+        return cls(tensors)
+
+    def shuffle(self, buffer_size, seed=None):
+        return self
+
+    def batch(self, batch_size):
+        return self
+
+    def prefetch(self, buffer_size):
+        return self
+
+class FakeEarlyStopping:
+    def __init__(self, **kwargs):
+        self.params = kwargs
+
+class FakeSequential:
+    """
+    Keras Sequential stand-in backed by a least-squares fit.
+    """
+    def __init__(self, layers=None):
+        self.layers = layers or []
+        self.coef = None
+
+    def compile(self, optimizer=None, loss=None):
+        pass
+
+    def get_weights(self):
+        return [np.zeros(3) if self.coef is None else self.coef]
+
+    def set_weights(self, weights):
+        self.coef = weights[0]
+
+    def fit(self, X, y=None, epochs=1, batch_size=None, verbose=0, **kwargs):
+        if isinstance(X, FakeDataset):
+            X, y = X.tensors
+        X = np.asarray(X, dtype=float)
+        X = np.column_stack([np.ones(len(X)), X])
+        self.coef = np.linalg.lstsq(X, np.asarray(y, dtype=float), rcond=None)[0]
+
+    def predict(self, X, verbose=0, **kwargs):
+        X = np.asarray(X, dtype=float)
+        if self.coef is None:
+            return np.zeros((len(X), 1))
+        return (np.column_stack([np.ones(len(X)), X]) @ self.coef)[:, None]
+
+class FakeTTSEngine:
+    def getProperty(self, name):
+        return []
+
+    def setProperty(self, name, value):
+        pass
+
+    def say(self, message):
+        pass
+
+    def runAndWait(self):
+        pass
+
+def install():
+    transformers = types.ModuleType("transformers")
+    transformers.pipeline = fake_pipeline
+
+    tensorflow = types.ModuleType("tensorflow")
+    keras = types.SimpleNamespace(
+        Sequential=FakeSequential,
+        layers=types.SimpleNamespace(Dense=FakeDense),
+        callbacks=types.SimpleNamespace(EarlyStopping=FakeEarlyStopping)
+    )
+    tensorflow.keras = keras
+    tensorflow.data = types.SimpleNamespace(Dataset=FakeDataset, AUTOTUNE=-1)
+
+    pyttsx3 = types.ModuleType("pyttsx3")
+    pyttsx3.init = lambda *args, **kwargs: FakeTTSEngine()
+
+    sys.modules["transformers"] = transformers
+    sys.modules["tensorflow"] = tensorflow
+    sys.modules["pyttsx3"] = pyttsx3
@@ -0,0 +1,321 @@
+# suite.py – repeatable benchmarks for the project's hot paths
+#
+#   python benchmarks/suite.py --output benchmarks/results/baseline.json
+#   python benchmarks/suite.py --filter loader --repeat 7
+#   python benchmarks/compare.py baseline.json current.json --threshold 0.15
+#
+# GPT-2, TensorFlow and pyttsx3 are replaced by the stand-ins in stubs.py
+# unless --real-deps is given, so the suite runs offline.
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+import numpy as np
+import pandas as pd
+
+BENCHMARKS = []
+
+class SkipBenchmark(Exception):
+    pass
+
+def benchmark(name, sizes=(None,)):
+    """
+    Register setup(size, workdir) -> zero-argument callable to be timed.
+    For integer sizes the callable processes `size` items per call; other
+    sizes just label variants.
+    """
+    def register(setup):
+        BENCHMARKS.append((name, sizes, setup))
+        return setup
+    return register
+
+def quiet(fn):
+    # Several hot paths print per call; keep that out of the timings' output
+    def wrapped():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn()
+    return wrapped
+
+def write_scenario_csv(workdir, rows, scenario="Prevent Ecological Collapse"):
+    from data_interface.real_data_loader import SCENARIO_FILE_MAP
+    data_folder = os.path.join(workdir, f"data_{rows}")
+    os.makedirs(data_folder, exist_ok=True)
+    rng = np.random.default_rng(rows)
+    pd.DataFrame({
+        'entanglement_density': rng.uniform(0.3, 0.7, rows).round(4),
+        'phase_alignment': rng.uniform(0.3, 0.7, rows).round(4),
+        'info_flow_1': rng.integers(450, 550, rows),
+        'info_flow_2': rng.integers(450, 550, rows)
+    }).to_csv(os.path.join(data_folder, SCENARIO_FILE_MAP[scenario]), index=False)
+    return data_folder
+
+def sample_features(rows):
+    rng = np.random.default_rng(rows)
+    return np.column_stack([
+        rng.uniform(0.4, 0.7, rows), rng.uniform(0.4, 0.7, rows),
+        rng.integers(450, 550, rows), rng.integers(450, 550, rows)
+    ])
+
+def make_ada_interface():
+    from ada_interface import ADAInterface
+    np.random.seed(0)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return ADAInterface(silent=True)
+
+def synthetic_profiles(count):
+    from qpras_hyperdonor_module import HNWI_LIST, generate_influence_profile
+    random.seed(count)
+    people = list(HNWI_LIST) + [
+        {"name": f"Donor {i}", "net_worth": 1_000_000_000, "interests": ["philanthropy"]}
+        for i in range(max(0, count - len(HNWI_LIST)))
+    ]
+    return [generate_influence_profile(p) for p in people[:count]]
+
+@benchmark("quantum.run_quantum_simulation", sizes=(1, 4))
+def bench_run_quantum_simulation(depth, workdir):
+    try:
+        from quantum_core.hex_formula_sim import run_quantum_simulation
+    except ImportError as e:
+        raise SkipBenchmark(f"qiskit unavailable: {e}")
+    return lambda: run_quantum_simulation(depth=depth)
+
+@benchmark("quantum.run_quantum_ensemble", sizes=(1_000, 100_000))
+def bench_run_quantum_ensemble(n, workdir):
+    try:
+        from quantum_core.hex_formula_sim import run_quantum_ensemble
+    except ImportError as e:
+        raise SkipBenchmark(f"qiskit unavailable: {e}")
+    return lambda: run_quantum_ensemble(n, depth=2, seed=0)
+
+@benchmark("quantum.compute_shannon_entropy", sizes=(4, 1024))
+def bench_compute_shannon_entropy(outcomes, workdir):
+    try:
+        from quantum_core.hex_formula_sim import compute_shannon_entropy
+    except ImportError as e:
+        raise SkipBenchmark(f"qiskit unavailable: {e}")
+    rng = np.random.default_rng(outcomes)
+    counts = {format(i, 'b'): int(c) for i, c in enumerate(rng.integers(1, 100, outcomes))}
+    return lambda: compute_shannon_entropy(counts)
+
+@benchmark("ada.analyze")
+def bench_analyze(size, workdir):
+    ada = make_ada_interface()
+    quantum_output = {'entanglement_density': 0.52, 'phase_alignment': 0.61, 'information_flow': [505, 498]}
+    return lambda: ada.analyze(quantum_output)
+
+@benchmark("ada.predict_outcome", sizes=("compiled", "sklearn"))
+def bench_predict_outcome(path, workdir):
+    ada = make_ada_interface()
+    if path == "compiled":
+        return lambda: ada.predict_outcome(0.61, 505, 498)
+    return lambda: ada.model.predict([[0.61, 505, 498]])[0]
+
+@benchmark("ada.analyze_batch", sizes=(1_000, 100_000))
+def bench_analyze_batch(rows, workdir):
+    ada = make_ada_interface()
+    features = sample_features(rows)
+    return lambda: ada.analyze_batch(features)
+
+@benchmark("loader.load_and_validate", sizes=(1_000, 100_000))
+def bench_load_and_validate(rows, workdir):
+    from data_interface.real_data_loader import RealWorldDataLoader
+    loader = RealWorldDataLoader("Prevent Ecological Collapse", write_scenario_csv(workdir, rows), preload=False)
+    return loader.load_and_validate
+
+@benchmark("loader.get_all_data", sizes=(1_000, 100_000))
+def bench_get_all_data(rows, workdir):
+    from data_interface.real_data_loader import RealWorldDataLoader, ScenarioDataCache
+    loader = RealWorldDataLoader("Prevent Ecological Collapse", write_scenario_csv(workdir, rows), cache=ScenarioDataCache())
+    return loader.get_all_data
+
+@benchmark("tracker.log_event", sizes=(100, 10_000))
+def bench_log_event(events, workdir):
+    from influence_tracker import InfluenceTracker
+    tracker = InfluenceTracker(os.path.join(workdir, f"log_{events}.csv"))
+
+    def log_all():
+        for i in range(events):
+            tracker.log_event("Benchmark", "Donation", f"event {i}")
+    return quiet(log_all)
+
+@benchmark("tracker.log_event_buffered", sizes=(100, 10_000))
+def bench_log_event_buffered(events, workdir):
+    from influence_tracker import InfluenceTracker
+    tracker = InfluenceTracker(os.path.join(workdir, f"buffered_{events}.csv"), buffered=True,
+                               max_queue=events * 2, flush_interval=0.05)
+
+    def log_all():
+        for i in range(events):
+            tracker.log_event("Benchmark", "Donation", f"event {i}")
+        tracker.flush()
+    return log_all
+
+@benchmark("hyperdonor.reinforce_profiles", sizes=(5, 100, 1_000))
+def bench_reinforce_profiles(count, workdir):
+    from qpras_hyperdonor_module import reinforce_profiles
+    profiles = synthetic_profiles(count)
+    return lambda: reinforce_profiles(profiles)
+
+@benchmark("hyperdonor.simulate_hyperdonor_campaign")
+def bench_simulate_hyperdonor_campaign(size, workdir):
+    from qpras_hyperdonor_module import simulate_hyperdonor_campaign
+    return quiet(simulate_hyperdonor_campaign)
+
+@benchmark("nudge.generate_nudge", sizes=(1_000, 100_000))
+def bench_generate_nudge(calls, workdir):
+    from nudge_scheduler import NudgeScheduler
+    scheduler = NudgeScheduler()
+
+    def generate_all():
+        for _ in range(calls):
+            scheduler.generate_nudge()
+    return generate_all
+
+@benchmark("ada.train_from_loader", sizes=("cold", "warm"))
+def bench_train_from_loader(start, workdir):
+    import shutil
+    from ai_ada_engine.ada_neural_core import ADAEngine
+    from data_interface.real_data_loader import RealWorldDataLoader, ScenarioDataCache
+    loader = RealWorldDataLoader("Prevent Ecological Collapse", write_scenario_csv(workdir, 100_000), cache=ScenarioDataCache())
+    state_dir = os.path.join(workdir, f"ada_{start}")
+    with contextlib.redirect_stdout(io.StringIO()):
+        ada = ADAEngine(state_dir=state_dir)
+    ada.train_from_loader(loader)
+    if start == "warm":
+        return lambda: ada.train_from_loader(loader)
+
+    def train_cold():
+        shutil.rmtree(ada.artifacts.directory)
+        os.makedirs(ada.artifacts.directory)
+        return ada.train_from_loader(loader)
+    return train_cold
+
+@benchmark("qlearning.transitions", sizes=(10_000, 1_000_000))
+def bench_q_learning_transitions(n, workdir):
+    from ai_ada_engine.q_learning import QLearningEngine, StateDiscretizer
+    discretizer = StateDiscretizer((50, 50, 40))
+    engine = QLearningEngine(discretizer.n_states, 100, memory_size=n, batch_size=1024, seed=0)
+    rng = np.random.default_rng(n)
+    features = np.column_stack([rng.random(n), rng.random(n), rng.random(n) * 50])
+    rewards = rng.standard_normal(n)
+
+    def learn():
+        # Discretize, act, store and apply one update per transition
+        states = discretizer.transform(features)
+        actions = engine.select_actions(states)
+        next_states = np.roll(states, -1)
+        engine.observe_batch(states, actions, rewards, next_states)
+        for i in range(0, n, engine.batch_size):
+            batch = slice(i, i + engine.batch_size)
+            engine.update_batch(states[batch], actions[batch], rewards[batch], next_states[batch])
+    return learn
+
+def signed_delivery(signer):
+    body = json.dumps({'id': "WH-BENCH", 'event_type': 'PAYMENT.SALE.COMPLETED',
+                       'resource': {'amount': {'total': "25.00", 'currency': 'USD'}}})
+    return body, signer(body)
+
+@benchmark("webhook.verify_rsa", sizes=("cached", "cold"))
+def bench_verify_rsa(cache, workdir):
+    from webhook_verification import LocalProvider
+    try:
+        provider = LocalProvider()
+    except ImportError as e:
+        raise SkipBenchmark(f"cryptography unavailable: {e}")
+    verifier = provider.verifier()
+    body, headers = signed_delivery(lambda b: provider.headers(b, "bench-transmission"))
+    if cache == "cached":
+        return lambda: verifier.verify(headers, body)
+
+    def verify_cold():
+        verifier.cert_cache.invalidate()
+        return verifier.verify(headers, body)
+    return verify_cold
+
+@benchmark("webhook.verify_hmac")
+def bench_verify_hmac(size, workdir):
+    from webhook_verification import HMACVerifier
+    verifier = HMACVerifier("bench-secret")
+
+    def sign(body):
+        headers = {'Paypal-Transmission-Id': "bench-transmission", 'Paypal-Transmission-Time': "2024-01-01T00:00:00Z"}
+        headers['Paypal-Transmission-Sig'] = verifier.sign(headers, body)
+        return headers
+    body, headers = signed_delivery(sign)
+    return lambda: verifier.verify(headers, body)
+
+def time_callable(fn, repeat):
+    fn()  # warm-up
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    samples = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {'min_s': min(samples), 'median_s': statistics.median(samples), 'calls_per_sample': number}
+
+def run(name_filter=None, repeat=5):
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, sizes, setup in BENCHMARKS:
+            if name_filter and name_filter not in name:
+                continue
+            for size in sizes:
+                key = name if size is None else f"{name}[{size}]"
+                try:
+                    fn = setup(size, workdir)
+                except SkipBenchmark as e:
+                    print(f"{key:48s} skipped ({e})")
+                    results[key] = {'name': name, 'size': size, 'skipped': str(e)}
+                    continue
+                timing = time_callable(fn, repeat)
+                timing.update(name=name, size=size)
+                if isinstance(size, int):
+                    timing['per_item_s'] = timing['median_s'] / size
+                results[key] = timing
+                print(f"{key:48s} median {timing['median_s'] * 1e3:10.4f} ms   min {timing['min_s'] * 1e3:10.4f} ms")
+    return results
+
+def environment():
+    return {
+        'created': datetime.datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the hot-path benchmark suite.")
+    parser.add_argument("--filter", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--real-deps", action="store_true", help="use the real GPT-2/TensorFlow/pyttsx3")
+    args = parser.parse_args()
+
+    if not args.real_deps:
+        import stubs
+        stubs.install()
+    # main.py and hex_formula_sim enable INFO logging on import; keep it out of the timed loops
+    logging.disable(logging.INFO)
+
+    output = args.output or os.path.join(
+        BENCH_DIR, "results", datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    report = {'environment': environment(), 'results': run(args.filter, args.repeat)}
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
@@ -0,0 +1,185 @@
+# webhook_load.py – sustained load against the /webhook endpoint
+#
+#   python benchmarks/webhook_load.py --mode queue --events 5000 --concurrency 16
+#   python benchmarks/webhook_load.py --mode sync --processing-ms 20
+#
+# A local stand-in provider posts signed PAYMENT.SALE.COMPLETED deliveries,
+# including duplicate redeliveries, over HTTP to the real Flask app, which
+# checks them with --verifier. ADAEngine is replaced by a stand-in that
+# spends --processing-ms per donation, to show what a slow model does to the
+# request path. Reports sustained events/sec and p50/p99 response latency.
+
+import argparse
+import contextlib
+import http.client
+import io
+import json
+import logging
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import uuid
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+class StandInProvider:
+    """
+    Produces webhook deliveries the way the payment provider would,
+    redelivering a fraction of earlier events with the same id.
+    """
+    def __init__(self, signer, duplicate_rate=0.05, seed=0):
+        self.signer = signer
+        self.duplicate_rate = duplicate_rate
+        self.rng = random.Random(seed)
+        self.sent = []
+
+    def delivery(self):
+        if self.sent and self.rng.random() < self.duplicate_rate:
+            return self.rng.choice(self.sent)
+        event_id = f"WH-{uuid.UUID(int=self.rng.getrandbits(128))}"
+        event = {
+            'id': event_id,
+            'event_type': 'PAYMENT.SALE.COMPLETED',
+            'resource': {
+                'payer': {'payer_info': {'first_name': self.rng.choice(["Ada", "Grace", "Alan", "Edsger"])}},
+                'amount': {'total': f"{self.rng.uniform(1, 500):.2f}", 'currency': 'USD'}
+            }
+        }
+        body = json.dumps(event)
+        headers = self.signer(body, str(uuid.UUID(int=self.rng.getrandbits(128))))
+        headers['Content-Type'] = 'application/json'
+        self.sent.append((body, headers))
+        return body, headers
+
+class StandInEngine:
+    # Real in-memory ledger, plus a simulated model cost per donation
+    def __init__(self, processing_ms):
+        from ai_ada_engine.donation_ledger import DonationLedger
+        self.processing_s = processing_ms / 1000
+        self.ledger = DonationLedger(journal_path=None)
+
+    @property
+    def donations(self):
+        return self.ledger.count
+
+    def update_donations(self, donor_name, amount_donated):
+        self.add_donations([(donor_name, amount_donated, 'paypal')])
+
+    def add_donations(self, donations):
+        time.sleep(self.processing_s * len(donations))
+        self.ledger.record_many(donations)
+
+def start_server(app):
+    from werkzeug.serving import make_server
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def client_loop(port, deliveries, latencies, statuses, lock):
+    for body, headers in deliveries:
+        conn = http.client.HTTPConnection("127.0.0.1", port)
+        start = time.perf_counter()
+        conn.request("POST", "/webhook", body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            statuses[response.status] = statuses.get(response.status, 0) + 1
+        conn.close()
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def make_signer(kind):
+    """
+    Returns (signer, verifier): signer(body, transmission_id) -> headers.
+    """
+    from webhook_verification import HMACVerifier, LocalProvider
+    if kind == "rsa":
+        provider = LocalProvider()
+        return provider.headers, provider.verifier()
+    hmac_verifier = HMACVerifier("load-test-secret")
+
+    def sign(body, transmission_id):
+        headers = {
+            'Paypal-Transmission-Id': transmission_id,
+            'Paypal-Transmission-Time': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        }
+        headers['Paypal-Transmission-Sig'] = hmac_verifier.sign(headers, body)
+        return headers
+    return sign, hmac_verifier
+
+def run(mode, events, concurrency, processing_ms, duplicate_rate, verifier_kind="rsa"):
+    os.environ["WEBHOOK_MODE"] = mode
+    import event_listener
+    event_listener.ada = StandInEngine(processing_ms)
+    signer, event_listener.verifier = make_signer(verifier_kind)
+
+    provider = StandInProvider(signer, duplicate_rate)
+    deliveries = [provider.delivery() for _ in range(events)]
+    server = start_server(event_listener.app)
+    port = server.server_port
+
+    latencies = []
+    statuses = {}
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=client_loop, args=(port, deliveries[i::concurrency], latencies, statuses, lock))
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    responded = time.perf_counter() - start
+    if event_listener.ingestor is not None:
+        event_listener.ingestor.flush()
+    drained = time.perf_counter() - start
+    server.shutdown()
+
+    report = {
+        'mode': mode,
+        'verifier': verifier_kind,
+        'events': events,
+        'concurrency': concurrency,
+        'processing_ms': processing_ms,
+        'events_per_second': events / responded,
+        'processed_per_second': event_listener.ada.donations / drained,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'statuses': statuses,
+        'donations_applied': event_listener.ada.donations
+    }
+    if event_listener.ingestor is not None:
+        report['ingestor'] = event_listener.ingestor.get_stats()
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the webhook endpoint with a stand-in provider.")
+    parser.add_argument("--mode", choices=("sync", "queue"), default="queue")
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--processing-ms", type=float, default=5.0, help="simulated model time per donation")
+    parser.add_argument("--duplicate-rate", type=float, default=0.05)
+    parser.add_argument("--verifier", choices=("rsa", "hmac"), default="rsa")
+    parser.add_argument("--real-deps", action="store_true", help="use the real GPT-2/TensorFlow/pyttsx3")
+    args = parser.parse_args()
+
+    if not args.real_deps:
+        import stubs
+        stubs.install()
+
+    # Per-donation prints and request logs would dominate the output
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    with contextlib.redirect_stdout(io.StringIO()):
+        report = run(args.mode, args.events, args.concurrency, args.processing_ms, args.duplicate_rate, args.verifier)
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,186 @@
+# campaign_scheduler.py – asyncio scheduler for concurrent nudge campaigns
+#
+# Each Campaign repeats its step every `interval` seconds until its funding
+# goal is met. Time comes from a pluggable clock: RealClock for production,
+# SimulatedClock to fast-forward weeks of cycles in seconds.
+
+import asyncio
+import contextlib
+import heapq
+import inspect
+import itertools
+import signal
+import time
+
+class RealClock:
+    def now(self):
+        return time.time()
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+    def busy(self):
+        return contextlib.nullcontext()
+
+class SimulatedClock:
+    """
+    Virtual clock: once every campaign is sleeping, time jumps straight to the
+    earliest wake-up. Work wrapped in busy() holds the clock still, so a step
+    running in a thread never sees time move underneath it.
+    """
+    def __init__(self, start=0.0):
+        self.current = start
+        self.sleepers = []
+        self.counter = itertools.count()
+        self.busy_count = 0
+        self.advance_scheduled = False
+
+    def now(self):
+        return self.current
+
+    async def sleep(self, seconds):
+        # The wake-up is registered as soon as the caller awaits, before it
+        # yields, so an advance can never skip past it
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        heapq.heappush(self.sleepers, (self.current + max(0.0, seconds), next(self.counter), future))
+        self.schedule_advance(loop)
+        await future
+
+    @contextlib.contextmanager
+    def busy(self):
+        self.busy_count += 1
+        try:
+            yield
+        finally:
+            self.busy_count -= 1
+            if self.busy_count == 0:
+                self.schedule_advance(asyncio.get_running_loop())
+
+    def schedule_advance(self, loop):
+        # call_soon runs after every task that is already ready, so all
+        # runnable campaigns reach their next sleep before time moves
+        if not self.advance_scheduled:
+            self.advance_scheduled = True
+            loop.call_soon(self.advance)
+
+    def advance(self):
+        self.advance_scheduled = False
+        if self.busy_count:
+            return
+        while self.sleepers and self.sleepers[0][2].done():
+            heapq.heappop(self.sleepers)
+        if not self.sleepers:
+            return
+        self.current = max(self.current, self.sleepers[0][0])
+        while self.sleepers and self.sleepers[0][0] <= self.current:
+            _, _, future = heapq.heappop(self.sleepers)
+            if not future.done():
+                future.set_result(None)
+
+class Campaign:
+    """
+    step(campaign) returns the donations raised in one cycle; it may be a
+    plain function (run in a worker thread) or a coroutine function.
+    on_iteration(campaign, donations), if given, is called after each cycle.
+    progress(), if given, returns the amount raised so far (e.g. from a
+    DonationLedger) and replaces summing the step results.
+    """
+    def __init__(self, name, step, interval=600, funding_goal=100_000_000_000, on_iteration=None, progress=None):
+        self.name = name
+        self.step = step
+        self.interval = interval
+        self.funding_goal = funding_goal
+        self.on_iteration = on_iteration
+        self.progress = progress
+        self.cumulative_donations = 0 if progress is None else progress()
+        self.iterations = 0
+        self.goal_reached_at = None
+
+    def summary(self):
+        return {
+            'name': self.name,
+            'iterations': self.iterations,
+            'cumulative_donations': self.cumulative_donations,
+            'funding_goal': self.funding_goal,
+            'goal_reached_at': self.goal_reached_at
+        }
+
+class CampaignScheduler:
+    def __init__(self, clock=None):
+        self.clock = clock or RealClock()
+        self.campaigns = []
+        self.sleeping = set()
+        self.stopping = False
+        self.deadline = None
+
+    def add(self, campaign):
+        self.campaigns.append(campaign)
+        return campaign
+
+    def stop(self):
+        # Campaigns mid-step finish that step; sleeping ones wake immediately
+        self.stopping = True
+        for task in self.sleeping:
+            task.cancel()
+
+    def should_stop(self):
+        return self.stopping or (self.deadline is not None and self.clock.now() >= self.deadline)
+
+    async def call_step(self, campaign):
+        if inspect.iscoroutinefunction(campaign.step):
+            return await campaign.step(campaign)
+        return await asyncio.to_thread(campaign.step, campaign)
+
+    async def run_campaign(self, campaign):
+        task = asyncio.current_task()
+        while True:
+            # Everything between waking and the next sleep holds the clock,
+            # including the exit check, so simulated time never runs ahead
+            with self.clock.busy():
+                if self.should_stop() or campaign.cumulative_donations >= campaign.funding_goal:
+                    break
+                donations = await self.call_step(campaign)
+                if campaign.progress is None:
+                    campaign.cumulative_donations += donations
+                else:
+                    campaign.cumulative_donations = campaign.progress()
+                campaign.iterations += 1
+                if campaign.on_iteration is not None:
+                    campaign.on_iteration(campaign, donations)
+                if campaign.cumulative_donations >= campaign.funding_goal:
+                    campaign.goal_reached_at = self.clock.now()
+                    break
+            self.sleeping.add(task)
+            try:
+                await self.clock.sleep(campaign.interval)
+            except asyncio.CancelledError:
+                if not self.stopping:
+                    raise
+                break
+            finally:
+                self.sleeping.discard(task)
+        return campaign.summary()
+
+    async def run(self, duration=None, handle_signals=True):
+        """
+        Run every campaign until it reaches its goal, `duration` clock
+        seconds pass, or SIGINT/SIGTERM arrives. Returns campaign summaries.
+        """
+        self.stopping = False
+        self.deadline = None if duration is None else self.clock.now() + duration
+        loop = asyncio.get_running_loop()
+        installed = []
+        if handle_signals:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                try:
+                    loop.add_signal_handler(sig, self.stop)
+                    installed.append(sig)
+                except (NotImplementedError, RuntimeError, ValueError):
+                    # Not the main thread, or a platform without signal support
+                    pass
+        try:
+            return await asyncio.gather(*(self.run_campaign(c) for c in self.campaigns))
+        finally:
+            for sig in installed:
+                loop.remove_signal_handler(sig)
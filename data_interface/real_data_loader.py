@@ -1,58 +1,185 @@
 import pandas as pd
 import numpy as np
 import os
+import threading
+import time
+import logging
+from instrumentation import timed
+
+SCENARIO_FILE_MAP = {
+    "Prevent Ecological Collapse": "prevent_ecological_collapse.csv",
+    "Stabilize Global Markets": "stabilize_global_markets.csv",
+    "Enhance Cognitive Evolution": "enhance_cognitive_evolution.csv",
+    "Minimize Existential Risk": "minimize_existential_risk.csv"
+}
+
+REQUIRED_COLUMNS = ['entanglement_density', 'phase_alignment', 'info_flow_1', 'info_flow_2']
+
+# A cached scenario is re-checked against its file at most this often, so hot
+# per-iteration lookups do not each pay for an os.stat
+STALE_CHECK_SECONDS = 1.0
+
+def validate_frame(df):
+    for col in REQUIRED_COLUMNS:
+        if col not in df.columns:
+            raise ValueError(f"Missing required column: {col}")
+
+    df['entanglement_density'] = df['entanglement_density'].clip(0.0, 1.0)
+    df['phase_alignment'] = df['phase_alignment'].clip(0.0, 1.0)
+    df['info_flow_1'] = df['info_flow_1'].astype(int)
+    df['info_flow_2'] = df['info_flow_2'].astype(int)
+    return df
+
+@timed("load_csv")
+def read_validated_columns(csv_path):
+    df = validate_frame(pd.read_csv(csv_path))
+    columns = {col: df[col].to_numpy(copy=True) for col in REQUIRED_COLUMNS}
+    # Columns are shared by every loader in the process, so keep them read-only
+    for values in columns.values():
+        values.setflags(write=False)
+    return columns
+
+def columns_to_dicts(columns):
+    return [
+        {
+            'entanglement_density': ent,
+            'phase_alignment': phase,
+            'information_flow': [info1, info2]
+        }
+        for ent, phase, info1, info2 in zip(*(columns[col].tolist() for col in REQUIRED_COLUMNS))
+    ]
+
+class ScenarioDataCache:
+    """
+    Process-wide cache of validated scenario columns, keyed by CSV path and
+    invalidated whenever the file's mtime or size changes. The file is
+    stat'ed at most every stale_check_seconds per path.
+    """
+    def __init__(self, stale_check_seconds=STALE_CHECK_SECONDS):
+        self.stale_check_seconds = stale_check_seconds
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def entry(self, csv_path):
+        # entry: {'signature', 'checked_at', 'columns', 'frame'}
+        path = os.path.abspath(csv_path)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and now - entry['checked_at'] < self.stale_check_seconds:
+                self.stats['hits'] += 1
+                return entry
+        stat = os.stat(path)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry['signature'] == signature:
+                entry['checked_at'] = now
+                self.stats['hits'] += 1
+                return entry
+            self.stats['misses'] += 1
+        entry = {'signature': signature, 'checked_at': now, 'columns': read_validated_columns(path), 'frame': None}
+        with self._lock:
+            self._entries[path] = entry
+        return entry
+
+    def get(self, csv_path):
+        return self.entry(csv_path)['columns']
+
+    def frame(self, csv_path):
+        """
+        The columns as a DataFrame, built once per file version. The frame
+        is shared by every caller, so treat it as read-only.
+        """
+        entry = self.entry(csv_path)
+        frame = entry['frame']
+        if frame is None:
+            frame = entry['frame'] = pd.DataFrame(entry['columns'])
+        return frame
+
+    def invalidate(self, csv_path=None):
+        with self._lock:
+            if csv_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(csv_path), None)
+
+    def prefetch(self, data_folder="data", scenarios=None, background=True):
+        paths = [os.path.join(data_folder, SCENARIO_FILE_MAP[s]) for s in (scenarios or SCENARIO_FILE_MAP)]
+
+        def load_all():
+            for path in paths:
+                try:
+                    self.get(path)
+                except (OSError, ValueError) as e:
+                    logging.warning(f"Scenario prefetch failed for {path}: {e}")
+
+        if not background:
+            load_all()
+            return None
+        thread = threading.Thread(target=load_all, name="scenario-prefetch", daemon=True)
+        thread.start()
+        return thread
+
+scenario_cache = ScenarioDataCache()
 
 class RealWorldDataLoader:
-    def __init__(self, scenario, data_folder="data"):
+    def __init__(self, scenario, data_folder="data", cache=scenario_cache, preload=True):
         self.data_folder = data_folder
         self.scenario = scenario
+        self.cache = cache
         self.csv_path = self.get_csv_for_scenario()
         if not os.path.exists(self.csv_path):
             raise FileNotFoundError(f"CSV not found at: {self.csv_path}")
-        self.data = self.load_and_validate()
+        # Very large scenario files can skip the in-memory copy and use iter_batches
+        if preload:
+            self.cache.get(self.csv_path)
+
+    @property
+    def columns(self):
+        return self.cache.get(self.csv_path)
+
+    @property
+    def data(self):
+        return self.cache.frame(self.csv_path)
 
     def get_csv_for_scenario(self):
-        scenario_file_map = {
-            "Prevent Ecological Collapse": "prevent_ecological_collapse.csv",
-            "Stabilize Global Markets": "stabilize_global_markets.csv",
-            "Enhance Cognitive Evolution": "enhance_cognitive_evolution.csv",
-            "Minimize Existential Risk": "minimize_existential_risk.csv"
-        }
-        scenario_file = scenario_file_map.get(self.scenario)
+        scenario_file = SCENARIO_FILE_MAP.get(self.scenario)
         if not scenario_file:
             raise ValueError(f"Unknown scenario: {self.scenario}")
         return os.path.join(self.data_folder, scenario_file)
 
     def load_and_validate(self):
-        df = pd.read_csv(self.csv_path)
-        required_cols = ['entanglement_density', 'phase_alignment', 'info_flow_1', 'info_flow_2']
-        for col in required_cols:
-            if col not in df.columns:
-                raise ValueError(f"Missing required column: {col}")
-
-        df['entanglement_density'] = df['entanglement_density'].clip(0.0, 1.0)
-        df['phase_alignment'] = df['phase_alignment'].clip(0.0, 1.0)
-        df['info_flow_1'] = df['info_flow_1'].astype(int)
-        df['info_flow_2'] = df['info_flow_2'].astype(int)
-        return df
+        return validate_frame(pd.read_csv(self.csv_path))
 
+    @timed("load")
     def get_simulation_input(self, row_index=None):
-        if self.data.empty:
+        columns = self.columns
+        num_rows = len(columns['entanglement_density'])
+        if num_rows == 0:
             raise ValueError("Data is empty or failed to load.")
 
-        row = self.data.sample(1).iloc[0] if row_index is None else self.data.iloc[row_index]
+        if row_index is None:
+            row_index = np.random.randint(num_rows)
         return {
-            'entanglement_density': float(row['entanglement_density']),
-            'phase_alignment': float(row['phase_alignment']),
-            'information_flow': [int(row['info_flow_1']), int(row['info_flow_2'])]
+            'entanglement_density': float(columns['entanglement_density'][row_index]),
+            'phase_alignment': float(columns['phase_alignment'][row_index]),
+            'information_flow': [int(columns['info_flow_1'][row_index]), int(columns['info_flow_2'][row_index])]
         }
 
     def get_all_data(self):
-        return [
-            {
-                'entanglement_density': float(row['entanglement_density']),
-                'phase_alignment': float(row['phase_alignment']),
-                'information_flow': [int(row['info_flow_1']), int(row['info_flow_2'])]
-            }
-            for _, row in self.data.iterrows()
-        ]
+        return columns_to_dicts(self.columns)
+
+    def iter_batches(self, batch_size=10000, as_dicts=False):
+        """
+        Stream the CSV in fixed-size chunks, validating each one. Yields dicts
+        of NumPy columns, or lists of get_all_data-style dicts when as_dicts
+        is set. Memory stays bounded by batch_size.
+        """
+        reader = pd.read_csv(self.csv_path, chunksize=batch_size, usecols=lambda col: col in REQUIRED_COLUMNS)
+        with reader:
+            for chunk in reader:
+                chunk = validate_frame(chunk)
+                columns = {col: chunk[col].to_numpy() for col in REQUIRED_COLUMNS}
+                yield columns_to_dicts(columns) if as_dicts else columns
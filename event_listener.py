@@ -1,7 +1,6 @@
 import os
 import json
-from flask import Flask, request, jsonify
-from paypalrestsdk import WebhookEvent
+from flask import Flask, Response, request, jsonify
 
 # Flask app setup
 app = Flask(__name__)
@@ -9,34 +8,125 @@ app = Flask(__name__)
 # Your previous logic imports
 from ada_neural_core import ADAEngine
 from ada_hyperdonor_interface import ADAHyperdonorInterface
+from ai_ada_engine.donation_ledger import parse_amount
+from instrumentation import registry, timed, PROMETHEUS_CONTENT_TYPE
+from webhook_ingest import DeadLetterStore, WebhookIngestor
+from webhook_verification import create_verifier
 
-# Initialize the ADAEngine
-ada = ADAEngine()
+# Initialize the ADAEngine (heavy models load on first use; ADA_WARMUP=1 preloads them in the background)
+ada = ADAEngine(warm_up=os.environ.get("ADA_WARMUP") == "1")
+registry.register_gauge("nlp_cache_hit_rate", lambda: ada.nlp_batcher.stats()['cache_hit_rate'])
+registry.register_gauge("nlp_tokens_per_second", lambda: ada.nlp_batcher.stats()['tokens_per_second'])
+
+# "sync" processes each event inside the request; "queue" only verifies,
+# enqueues and answers 202, leaving the work to WebhookIngestor's workers
+WEBHOOK_MODE = os.environ.get("WEBHOOK_MODE", "sync")
+
+# Certificates are cached per URL, so only the first request per signing
+# certificate pays for the download (see webhook_verification.py)
+verifier = create_verifier()
+
+def verify_webhook(headers, payload):
+    return verifier.verify(headers, payload)
+
+def parse_donation(event):
+    # Ensure the event type is what you are interested in
+    if event['event_type'] != 'PAYMENT.SALE.COMPLETED':
+        return None
+    donation_data = event['resource']
+    donor_name = donation_data['payer']['payer_info']['first_name']
+    # Checked per event, so one bad amount cannot fail the rest of a batch
+    amount_donated = parse_amount(donation_data['amount']['total'])
+    return donor_name, amount_donated
+
+def process_event(event):
+    donation = parse_donation(event)
+    if donation is None:
+        return False
+    donor_name, amount_donated = donation
+
+    print(f"Donation received from {donor_name} for ${amount_donated}")
+
+    # Here you update the system with the real donation information
+    ada.update_donations(donor_name, amount_donated)
+    return True
+
+def process_events(events):
+    # One ledger write for the whole batch; returns (event, error) pairs for
+    # the events that failed
+    donations = []
+    donation_events = []
+    failed = []
+    for event in events:
+        try:
+            donation = parse_donation(event)
+        except (KeyError, TypeError, ValueError) as e:
+            print(f"[Webhook] Failed to process event {event.get('id')}: {e!r}")
+            failed.append((event, e))
+            continue
+        if donation is not None:
+            donations.append((donation[0], donation[1], 'paypal'))
+            donation_events.append(event)
+    if donations:
+        try:
+            ada.add_donations(donations)
+        except Exception as e:
+            print(f"[Webhook] Failed to record {len(donations)} donations: {e}")
+            failed.extend((event, e) for event in donation_events)
+    return failed
+
+ingestor = None
+if WEBHOOK_MODE == "queue":
+    ingestor = WebhookIngestor(
+        process_events,
+        workers=int(os.environ.get("WEBHOOK_WORKERS", "2")),
+        batch_size=int(os.environ.get("WEBHOOK_BATCH_SIZE", "64")),
+        dead_letters=DeadLetterStore(os.environ.get("WEBHOOK_DEAD_LETTERS", "ada_state/webhook_dead_letters.jsonl"))
+    )
+    registry.register_gauge("webhook_queue_depth", lambda: ingestor.queue.qsize())
 
 # Webhook route for PayPal notifications
 @app.route('/webhook', methods=['POST'])
+@timed("webhook")
 def paypal_webhook():
     payload = request.get_data(as_text=True)
-    sig_header = request.headers.get('Paypal-Transmission-Sig')
-    webhook_id = "6T150257H83796942"
-    # Use the correct PayPal API to verify the event
-    if WebhookEvent.verify(webhook_id, sig_header, payload):
+    if not verify_webhook(request.headers, payload):
+        return jsonify({'status': 'failure'}), 400
+    try:
         event = json.loads(payload)
+    except ValueError:
+        return jsonify({'status': 'failure'}), 400
+    if not isinstance(event, dict):
+        return jsonify({'status': 'failure'}), 400
 
-        # Ensure the event type is what you are interested in
-        if event['event_type'] == 'PAYMENT.SALE.COMPLETED':
-            donation_data = event['resource']
-            donor_name = donation_data['payer']['payer_info']['first_name']
-            amount_donated = donation_data['amount']['total']
-            
-            print(f"Donation received from {donor_name} for ${amount_donated}")
-
-            # Here you update the system with the real donation information
-            ada.update_donations(donor_name, amount_donated)
-            
-            return jsonify({'status': 'success'}), 200
+    if ingestor is not None:
+        # Deduplicate on the event id; provider retries redeliver the same id
+        event_id = event.get('id') or request.headers.get('Paypal-Transmission-Id')
+        if not event_id or 'event_type' not in event:
+            return jsonify({'status': 'failure'}), 400
+        result = ingestor.submit(event_id, event)
+        if result == 'rejected':
+            return jsonify({'status': 'busy'}), 503
+        return jsonify({'status': result}), 202 if result == 'accepted' else 200
+
+    try:
+        processed = process_event(event)
+    except (KeyError, TypeError, ValueError) as e:
+        # A non-2xx answer makes the provider redeliver the event later
+        print(f"[Webhook] Failed to process event {event.get('id')}: {e!r}")
+        processed = False
+    if processed:
+        return jsonify({'status': 'success'}), 200
     return jsonify({'status': 'failure'}), 400
 
+@app.route('/metrics')
+def metrics():
+    return Response(registry.render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+@app.route('/status')
+def status():
+    return jsonify(ada.ledger.summary())
+
 # Method to update real donations
 def update_donations(donor_name, amount_donated):
     # Update your model with the donation
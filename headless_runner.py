@@ -0,0 +1,136 @@
+# headless_runner.py – batch driver for the loader -> analyze -> nudge pipeline
+#
+# Runs N iterations per scenario without Tk or pyttsx3, spread over a process
+# pool, and writes the results as compressed NumPy columns (.npz).
+#
+#   python headless_runner.py --iterations 1000000 --workers 8 --output results.npz
+#   python headless_runner.py --iterations 1000000 --scaling
+
+import argparse
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from ada_interface import ADAInterface, GOAL_LABELS, SCENARIO_GOALS
+from data_interface.real_data_loader import RealWorldDataLoader, SCENARIO_FILE_MAP
+from simulation_world.state_nudging import RealitySimulator, NUDGE_OUTCOMES
+
+SCENARIOS = list(SCENARIO_FILE_MAP)
+
+def run_chunk(task):
+    """
+    Worker: run one chunk of iterations for one scenario.
+    """
+    scenario, iterations, model_seed, sample_seed, data_folder = task
+    started = time.perf_counter()
+
+    # Every worker trains the same model; only row sampling differs per chunk
+    np.random.seed(model_seed)
+    random.seed(model_seed)
+    ada = ADAInterface(silent=True)
+    simulator = RealitySimulator(verbose=False)
+    loader = RealWorldDataLoader(scenario, data_folder)
+
+    rng = np.random.default_rng(sample_seed)
+    columns = loader.columns
+    rows = rng.integers(len(columns['entanglement_density']), size=iterations)
+    features = np.column_stack([
+        columns['entanglement_density'][rows],
+        columns['phase_alignment'][rows],
+        columns['info_flow_1'][rows],
+        columns['info_flow_2'][rows]
+    ])
+    analysis = ada.analyze_batch(features, scenario)
+    outcome = simulator.nudge_probability_batch(analysis['influence_score'])
+    ada.speech.close()
+
+    result = {
+        'scenario': np.full(iterations, SCENARIOS.index(scenario), dtype=np.uint8),
+        'row': rows.astype(np.int32),
+        'predicted_entanglement_density': analysis['predicted_entanglement_density'].astype(np.float32),
+        'influence_score': analysis['influence_score'].astype(np.float32),
+        'goal_evaluation': analysis['goal_evaluation'],
+        'outcome': outcome
+    }
+    for goal, codes in analysis['multi_objective_summary'].items():
+        result[f'goal_{goal.lower()}'] = codes
+    return result, time.perf_counter() - started
+
+def build_tasks(scenarios, iterations, workers, seed, data_folder):
+    # Split each scenario into roughly one chunk per worker, each with its own
+    # independent sample stream spawned from the base seed
+    chunk = max(1, -(-iterations // workers))
+    counts = []
+    for scenario in scenarios:
+        for start in range(0, iterations, chunk):
+            counts.append((scenario, min(chunk, iterations - start)))
+    seeds = np.random.SeedSequence(seed).spawn(len(counts))
+    return [(scenario, count, seed, child, data_folder) for (scenario, count), child in zip(counts, seeds)]
+
+def run(scenarios, iterations, workers, seed=0, data_folder="data"):
+    if not scenarios or iterations < 1 or workers < 1:
+        raise ValueError("run needs at least one scenario, one iteration and one worker")
+    tasks = build_tasks(scenarios, iterations, workers, seed, data_folder)
+    started = time.perf_counter()
+    if workers == 1:
+        outputs = [run_chunk(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outputs = list(pool.map(run_chunk, tasks))
+    elapsed = time.perf_counter() - started
+
+    columns = {key: np.concatenate([out[key] for out, _ in outputs]) for key in outputs[0][0]}
+    total = len(scenarios) * iterations
+    stats = {
+        'iterations': total,
+        'workers': workers,
+        'seconds': elapsed,
+        'iterations_per_sec': total / elapsed,
+        'iterations_per_sec_per_core': total / elapsed / workers,
+        'worker_seconds': sum(seconds for _, seconds in outputs)
+    }
+    return columns, stats
+
+def save_results(path, columns):
+    np.savez_compressed(
+        path,
+        scenario_names=np.array(SCENARIOS),
+        scenario_goals=np.array([SCENARIO_GOALS[s] for s in SCENARIOS]),
+        goal_labels=np.array([GOAL_LABELS[SCENARIO_GOALS[s]] for s in SCENARIOS]),
+        outcome_labels=np.array(NUDGE_OUTCOMES),
+        **columns
+    )
+
+def print_stats(stats):
+    print(f"{stats['iterations']:,} iterations on {stats['workers']} worker(s) in {stats['seconds']:.2f}s: "
+          f"{stats['iterations_per_sec']:,.0f} it/s total, {stats['iterations_per_sec_per_core']:,.0f} it/s per core")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the simulation pipeline headless across a process pool.")
+    parser.add_argument("--iterations", type=int, default=100_000, help="iterations per scenario")
+    parser.add_argument("--scenarios", nargs="+", default=SCENARIOS, choices=SCENARIOS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-folder", default="data")
+    parser.add_argument("--output", default="headless_results.npz")
+    parser.add_argument("--scaling", action="store_true", help="measure speedup for 1, 2, 4 ... workers")
+    args = parser.parse_args()
+    if args.iterations < 1:
+        parser.error("--iterations must be at least 1")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if args.scaling:
+        baseline = None
+        counts = sorted({1} | {2 ** i for i in range(1, args.workers.bit_length()) if 2 ** i <= args.workers} | {args.workers})
+        for workers in counts:
+            _, stats = run(args.scenarios, args.iterations, workers, args.seed, args.data_folder)
+            baseline = baseline or stats['iterations_per_sec']
+            print_stats(stats)
+            print(f"  speedup x{stats['iterations_per_sec'] / baseline:.2f} (ideal x{workers})")
+    else:
+        columns, stats = run(args.scenarios, args.iterations, args.workers, args.seed, args.data_folder)
+        save_results(args.output, columns)
+        print_stats(stats)
+        print(f"Results written to {args.output}")
@@ -0,0 +1,198 @@
+import csv
+import datetime
+import io
+import os
+import sqlite3
+import sys
+import threading
+from collections import Counter
+
+FIELDS = ['timestamp', 'source', 'event_type', 'details']
+
+# count_by groupings: plain columns or timestamp prefixes (ISO 8601 strings)
+GROUPINGS = {
+    'source': None,
+    'event_type': None,
+    'day': 10,
+    'hour': 13
+}
+
+def to_timestamp(value):
+    if value is None or isinstance(value, str):
+        return value
+    return value.isoformat()
+
+def group_key(entry, field):
+    if field not in GROUPINGS:
+        raise ValueError(f"Unknown count_by field: {field}")
+    prefix = GROUPINGS[field]
+    return entry['timestamp'][:prefix] if prefix else entry[field]
+
+class CSVInfluenceStore:
+    """
+    The original flat CSV log. Queries scan the whole file.
+    """
+    def __init__(self, log_file='convergence_log.csv', rotate_bytes=None, rotate_daily=False):
+        self.log_file = log_file
+        self.rotate_bytes = rotate_bytes
+        self.rotate_daily = rotate_daily
+        self.rotations = 0
+        self.current_date = datetime.datetime.utcnow().date()
+        self.ensure_header()
+
+    def ensure_header(self):
+        if not os.path.exists(self.log_file):
+            with open(self.log_file, mode='w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=FIELDS)
+                writer.writeheader()
+
+    def maybe_rotate(self):
+        today = datetime.datetime.utcnow().date()
+        if self.rotate_daily and today != self.current_date:
+            suffix = self.current_date.isoformat()
+        elif self.rotate_bytes and os.path.exists(self.log_file) and os.path.getsize(self.log_file) >= self.rotate_bytes:
+            suffix = datetime.datetime.utcnow().strftime('%Y%m%dT%H%M%S%f')
+        else:
+            return
+        self.current_date = today
+        root, ext = os.path.splitext(self.log_file)
+        if os.path.exists(self.log_file):
+            os.replace(self.log_file, f"{root}.{suffix}{ext}")
+        self.ensure_header()
+        self.rotations += 1
+
+    def append(self, entries):
+        self.maybe_rotate()
+        with open(self.log_file, mode='a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writerows(entries)
+
+    def iter_entries(self):
+        with open(self.log_file, mode='r', newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+
+    def query(self, event_type=None, since=None, until=None, source=None, limit=None):
+        since, until = to_timestamp(since), to_timestamp(until)
+        results = []
+        for entry in self.iter_entries():
+            if event_type is not None and entry['event_type'] != event_type:
+                continue
+            if source is not None and entry['source'] != source:
+                continue
+            if since is not None and entry['timestamp'] < since:
+                continue
+            if until is not None and entry['timestamp'] >= until:
+                continue
+            results.append(entry)
+            if limit is not None and len(results) >= limit:
+                break
+        return results
+
+    def count_by(self, field, event_type=None, since=None, until=None, source=None):
+        entries = self.query(event_type=event_type, since=since, until=until, source=source)
+        return dict(Counter(group_key(entry, field) for entry in entries))
+
+    def read_all(self):
+        with open(self.log_file, mode='r', encoding='utf-8') as f:
+            return f.read()
+
+    def close(self):
+        pass
+
+class SQLiteInfluenceStore:
+    """
+    Embedded SQLite log with indexes on timestamp, source and event_type, so
+    filtered queries are index range scans regardless of log size.
+    """
+    def __init__(self, db_path='convergence_log.db'):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                "id INTEGER PRIMARY KEY, timestamp TEXT NOT NULL, source TEXT, event_type TEXT, details TEXT)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (timestamp)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_type_time ON events (event_type, timestamp)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_events_source_time ON events (source, timestamp)")
+
+    def append(self, entries):
+        rows = [(e['timestamp'], e['source'], e['event_type'], e['details']) for e in entries]
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO events (timestamp, source, event_type, details) VALUES (?, ?, ?, ?)", rows
+            )
+
+    def build_filter(self, event_type, since, until, source):
+        clauses, params = [], []
+        for clause, value in (("event_type = ?", event_type), ("source = ?", source),
+                              ("timestamp >= ?", to_timestamp(since)), ("timestamp < ?", to_timestamp(until))):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(self, event_type=None, since=None, until=None, source=None, limit=None):
+        where, params = self.build_filter(event_type, since, until, source)
+        sql = f"SELECT timestamp, source, event_type, details FROM events{where} ORDER BY timestamp"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def count_by(self, field, event_type=None, since=None, until=None, source=None):
+        if field not in GROUPINGS:
+            raise ValueError(f"Unknown count_by field: {field}")
+        prefix = GROUPINGS[field]
+        key = f"substr(timestamp, 1, {prefix})" if prefix else field
+        where, params = self.build_filter(event_type, since, until, source)
+        sql = f"SELECT {key} AS bucket, COUNT(*) FROM events{where} GROUP BY bucket ORDER BY bucket"
+        with self.lock:
+            return {bucket: count for bucket, count in self.conn.execute(sql, params)}
+
+    def read_all(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT timestamp, source, event_type, details FROM events ORDER BY id").fetchall()
+        buffer = io.StringIO(newline='')
+        writer = csv.writer(buffer)
+        writer.writerow(FIELDS)
+        writer.writerows(rows)
+        return buffer.getvalue()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+def import_csv_log(csv_path, store, batch_size=5000):
+    """
+    One-shot import of an existing CSV log into another store.
+    Returns the number of imported events.
+    """
+    imported = 0
+    batch = []
+    with open(csv_path, mode='r', newline='', encoding='utf-8') as f:
+        for entry in csv.DictReader(f):
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                store.append(batch)
+                imported += len(batch)
+                batch = []
+    if batch:
+        store.append(batch)
+        imported += len(batch)
+    return imported
+
+if __name__ == "__main__":
+    # Usage: python influence_store.py [convergence_log.csv] [convergence_log.db]
+    source_csv = sys.argv[1] if len(sys.argv) > 1 else 'convergence_log.csv'
+    target_db = sys.argv[2] if len(sys.argv) > 2 else 'convergence_log.db'
+    sqlite_store = SQLiteInfluenceStore(target_db)
+    count = import_csv_log(source_csv, sqlite_store)
+    sqlite_store.close()
+    print(f"Imported {count} events from {source_csv} into {target_db}")
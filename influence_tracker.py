@@ -1,17 +1,36 @@
-
 import datetime
-import csv
-import os
+import queue
+import time
+import threading
+import atexit
+from influence_store import CSVInfluenceStore
+from instrumentation import timed
+
+# A failing batch is retried this many times before its events are dropped
+WRITE_ATTEMPTS = 3
+
+# Queued by flush() so the writer commits without waiting out flush_interval
+FLUSH = object()
 
 class InfluenceTracker:
-    def __init__(self, log_file='convergence_log.csv'):
+    def __init__(self, log_file='convergence_log.csv', buffered=False, max_queue=10000,
+                 batch_size=256, flush_interval=1.0, rotate_bytes=None, rotate_daily=False, store=None):
         self.log_file = log_file
         self.fields = ['timestamp', 'source', 'event_type', 'details']
+        # Any object with append/query/count_by/read_all, e.g. SQLiteInfluenceStore
+        self.store = store or CSVInfluenceStore(log_file, rotate_bytes=rotate_bytes, rotate_daily=rotate_daily)
+        self.buffered = buffered
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = {'written': 0, 'batches': 0, 'dropped': 0, 'failed_batches': 0}
+        self.stats_lock = threading.Lock()
 
-        if not os.path.exists(self.log_file):
-            with open(self.log_file, mode='w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=self.fields)
-                writer.writeheader()
+        if buffered:
+            self.queue = queue.Queue(maxsize=max_queue)
+            self.stop_event = threading.Event()
+            self.writer_thread = threading.Thread(target=self.writer_loop, name="influence-writer", daemon=True)
+            self.writer_thread.start()
+            atexit.register(self.close)
 
     def log_event(self, source, event_type, details):
         entry = {
@@ -20,11 +39,88 @@ class InfluenceTracker:
             'event_type': event_type,
             'details': details
         }
-        with open(self.log_file, mode='a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.fields)
-            writer.writerow(entry)
+        if self.buffered:
+            try:
+                self.queue.put_nowait(entry)
+            except queue.Full:
+                with self.stats_lock:
+                    self.stats['dropped'] += 1
+            return
+        self.write_batch([entry])
         print(f"[Tracker] Logged event: {entry}")
 
+    @timed("tracker_write")
+    def write_batch(self, entries):
+        self.store.append(entries)
+        with self.stats_lock:
+            self.stats['written'] += len(entries)
+            self.stats['batches'] += 1
+
+    def writer_loop(self):
+        # Group commit: write whatever has accumulated once the batch is full
+        # or flush_interval has elapsed since the first queued entry
+        while True:
+            try:
+                items = [self.queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                if self.stop_event.is_set():
+                    return
+                continue
+            deadline = time.monotonic() + self.flush_interval
+            while items[-1] is not FLUSH and len(items) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            batch = [item for item in items if item is not FLUSH]
+            try:
+                if batch:
+                    self.write_with_retry(batch)
+            finally:
+                for _ in items:
+                    self.queue.task_done()
+
+    def write_with_retry(self, batch):
+        # A storage error must not kill the writer thread, or every later
+        # event would be queued into a dead pipeline and flush() would hang
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                self.write_batch(batch)
+                return
+            except Exception as e:
+                print(f"[Tracker] Writing {len(batch)} events failed (attempt {attempt}/{WRITE_ATTEMPTS}): {e}")
+                if attempt < WRITE_ATTEMPTS:
+                    time.sleep(0.1 * attempt)
+        with self.stats_lock:
+            self.stats['failed_batches'] += 1
+            self.stats['dropped'] += len(batch)
+
+    def flush(self):
+        if self.buffered and self.writer_thread.is_alive():
+            self.queue.put(FLUSH)
+            self.queue.join()
+
+    def close(self):
+        if self.buffered and self.writer_thread.is_alive():
+            self.flush()
+            self.stop_event.set()
+            self.writer_thread.join()
+
+    def get_stats(self):
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats['queue_depth'] = self.queue.qsize() if self.buffered else 0
+        stats['rotations'] = getattr(self.store, 'rotations', 0)
+        return stats
+
+    def query(self, event_type=None, since=None, until=None, source=None, limit=None):
+        return self.store.query(event_type=event_type, since=since, until=until, source=source, limit=limit)
+
+    def count_by(self, field, event_type=None, since=None, until=None, source=None):
+        return self.store.count_by(field, event_type=event_type, since=since, until=until, source=source)
+
     def show_log(self):
-        with open(self.log_file, mode='r', encoding='utf-8') as f:
-            return f.read()
+        return self.store.read_all()
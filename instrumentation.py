@@ -0,0 +1,186 @@
+# instrumentation.py – per-stage timing, counters and Prometheus text export
+#
+# Stages are timed with `with timer("analyze"):` or the @timed("analyze")
+# decorator. Set QPRAS_METRICS=0 to disable collection; disabled timers are a
+# shared no-op object, so instrumented code pays one attribute check.
+
+import bisect
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+from functools import wraps
+
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+class NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+NULL_TIMER = NullTimer()
+
+class StageTimer:
+    def __init__(self, registry, stage):
+        self.registry = registry
+        self.stage = stage
+        self.profiler = None
+
+    def __enter__(self):
+        if self.registry.profile_requests and self.stage in self.registry.profile_requests:
+            self.profiler = self.registry.claim_profile(self.stage)
+            if self.profiler is not None:
+                self.profiler.enable()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        if self.profiler is not None:
+            self.profiler.disable()
+            self.registry.store_profile(self.stage, self.profiler)
+        self.registry.observe(self.stage, elapsed, failed=exc_type is not None)
+        return False
+
+class MetricsRegistry:
+    def __init__(self, enabled=True, prefix="qpras"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.errors = {}
+        self.counters = {}
+        self.gauges = {}
+        self.profile_requests = set()
+        self.profiles = {}
+
+    def timer(self, stage):
+        if not self.enabled:
+            return NULL_TIMER
+        return StageTimer(self, stage)
+
+    def timed(self, stage):
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                with StageTimer(self, stage):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def observe(self, stage, seconds, failed=False):
+        with self.lock:
+            histogram = self.histograms.get(stage)
+            if histogram is None:
+                histogram = self.histograms[stage] = Histogram()
+            histogram.observe(seconds)
+            if failed:
+                self.errors[stage] = self.errors.get(stage, 0) + 1
+
+    def inc(self, name, value=1):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def register_gauge(self, name, fn):
+        """
+        fn() is evaluated at scrape time and must return a number.
+        """
+        self.gauges[name] = fn
+
+    def profile_next(self, stage):
+        """
+        Profile the next execution of `stage` with cProfile; the report is
+        available from get_profile(stage) afterwards.
+        """
+        with self.lock:
+            self.profile_requests.add(stage)
+
+    def claim_profile(self, stage):
+        with self.lock:
+            if stage not in self.profile_requests:
+                return None
+            self.profile_requests.discard(stage)
+        return cProfile.Profile()
+
+    def store_profile(self, stage, profiler, limit=25):
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+        with self.lock:
+            self.profiles[stage] = out.getvalue()
+
+    def get_profile(self, stage):
+        with self.lock:
+            return self.profiles.get(stage)
+
+    def reset(self):
+        with self.lock:
+            self.histograms.clear()
+            self.errors.clear()
+            self.counters.clear()
+
+    def render_prometheus(self):
+        name = f"{self.prefix}_stage_duration_seconds"
+        lines = [f"# HELP {name} Time spent per pipeline stage.", f"# TYPE {name} histogram"]
+        with self.lock:
+            histograms = {stage: (list(h.counts), h.sum, h.count, h.buckets) for stage, h in self.histograms.items()}
+            errors = dict(self.errors)
+            counters = dict(self.counters)
+        for stage, (counts, total, count, buckets) in sorted(histograms.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {total}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {count}')
+
+        errors_name = f"{self.prefix}_stage_errors_total"
+        lines += [f"# HELP {errors_name} Stage executions that raised.", f"# TYPE {errors_name} counter"]
+        for stage, count in sorted(errors.items()):
+            lines.append(f'{errors_name}{{stage="{stage}"}} {count}')
+
+        for counter, value in sorted(counters.items()):
+            lines += [f"# TYPE {self.prefix}_{counter} counter", f"{self.prefix}_{counter} {value}"]
+        for gauge, fn in sorted(self.gauges.items()):
+            try:
+                value = float(fn())
+            except Exception:
+                continue
+            lines += [f"# TYPE {self.prefix}_{gauge} gauge", f"{self.prefix}_{gauge} {value}"]
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry(enabled=os.environ.get("QPRAS_METRICS", "1") != "0")
+timer = registry.timer
+timed = registry.timed
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+def profile_once(fn, *args, limit=25, **kwargs):
+    """
+    Run fn once under cProfile; returns (result, report text).
+    """
+    profiler = cProfile.Profile()
+    result = profiler.runcall(fn, *args, **kwargs)
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(limit)
+    return result, out.getvalue()
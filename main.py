@@ -1,108 +1,42 @@
 import tkinter as tk
 import time
+import queue
+import threading
+import sys
 import numpy as np
-import pyttsx3
 from quantum_core.hex_formula_sim import run_quantum_simulation
 from ai_ada_engine.ada_neural_core import ADAEngine
 from simulation_world.state_nudging import RealitySimulator
-from data_interface.real_data_loader import RealWorldDataLoader
+from data_interface.real_data_loader import RealWorldDataLoader, scenario_cache
+from ada_interface import (ADAInterface, SpeechQueue, SilentSpeechEngine, generate_quantum_data,
+                           GOAL_LABELS, SCENARIO_GOALS, evaluate_goal_codes, decode_goal_status)
 import logging
 import os
-from sklearn.tree import DecisionTreeRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def generate_quantum_data(num_samples=100):
-    entanglement_density = np.random.uniform(0.4, 0.6, num_samples)
-    phase_alignment = np.random.uniform(0.4, 0.6, num_samples)
-    information_flow_1 = np.random.randint(450, 550, num_samples)
-    information_flow_2 = np.random.randint(450, 550, num_samples)
-    return np.column_stack([entanglement_density, phase_alignment, information_flow_1, information_flow_2])
-
-class ADAInterface:
-    def __init__(self):
-        self.model = DecisionTreeRegressor(random_state=42)
-        self.engine = pyttsx3.init()
-        self.set_female_voice()
-        self.train_model()
-        self.current_scenario = "Prevent Ecological Collapse"
-        self.goal_functions = {
-            "Prevent Ecological Collapse": self.evaluate_ecological_collapse,
-            "Stabilize Global Markets": self.evaluate_market_stability,
-            "Enhance Cognitive Evolution": self.evaluate_cognitive_evolution,
-            "Minimize Existential Risk": self.evaluate_existential_risk
-        }
-
-    def set_female_voice(self):
-        voices = self.engine.getProperty('voices')
-        for voice in voices:
-            if 'female' in voice.name.lower() or 'zira' in voice.name.lower():
-                self.engine.setProperty('voice', voice.id)
-                break
-        self.engine.setProperty('rate', 178)
-
-    def speak(self, message):
-        self.engine.say(message)
-        self.engine.runAndWait()
-
-    def train_model(self):
-        quantum_data = generate_quantum_data(100)
-        self.features = quantum_data[:, 1:]
-        self.labels = quantum_data[:, 0]
-        X_train, X_test, y_train, y_test = train_test_split(self.features, self.labels, test_size=0.2, random_state=42)
-        self.model.fit(X_train, y_train)
-        mse = mean_squared_error(y_test, self.model.predict(X_test))
-        print(f'Model training complete. Mean Squared Error: {mse}')
-
-    def predict_outcome(self, phase_alignment, info1, info2):
-        return self.model.predict([[phase_alignment, info1, info2]])[0]
-
-    def analyze(self, quantum_output):
-        ent = quantum_output['entanglement_density']
-        phase = quantum_output['phase_alignment']
-        info1, info2 = quantum_output['information_flow']
-        predicted = self.predict_outcome(phase, info1, info2)
-        score = round(predicted * 100, 2)
-        evaluation = self.goal_functions[self.current_scenario](ent, phase, info1, info2)
-        multi_objective = self.evaluate_multi_goals(ent, phase, info1, info2)
-        return {
-            'predicted_entanglement_density': predicted,
-            'analysis_details': f"Phase Alignment: {phase}, Info Flow: {[info1, info2]}",
-            'influence_score': score,
-            'goal_evaluation': evaluation,
-            'multi_objective_summary': multi_objective
-        }
-
-    def evaluate_ecological_collapse(self, ent, phase, info1, info2):
-        return "Stable" if ent < 0.5 and phase > 0.6 else "Warning: Ecological instability"
-
-    def evaluate_market_stability(self, ent, phase, info1, info2):
-        return "Stable" if abs(info1 - info2) < 10 else "Market imbalance detected"
-
-    def evaluate_cognitive_evolution(self, ent, phase, info1, info2):
-        return "Progressing" if ent > 0.55 and phase > 0.55 else "Lagging"
-
-    def evaluate_existential_risk(self, ent, phase, info1, info2):
-        return "Safe" if ent > 0.45 and phase > 0.45 else "Elevated Threat"
-
-    def evaluate_multi_goals(self, ent, phase, info1, info2):
-        return {
-            "Ecology": self.evaluate_ecological_collapse(ent, phase, info1, info2),
-            "Markets": self.evaluate_market_stability(ent, phase, info1, info2),
-            "Cognition": self.evaluate_cognitive_evolution(ent, phase, info1, info2),
-            "Existence": self.evaluate_existential_risk(ent, phase, info1, info2)
-        }
+# Continuous mode: how often the UI drains worker results, and how many
+# undrained results the worker may queue before older ones are discarded
+UI_REFRESH_MS = 100
+RESULT_QUEUE_SIZE = 64
+PIPELINE_STAGES = ("load", "analyze", "nudge", "speak")
 
 class QuantumSimulationApp:
-    def __init__(self, root):
+    def __init__(self, root, silent=False):
         self.root = root
         self.root.title("HEX Quantum-AI Reality Influence Simulation")
         self.root.geometry("750x600")
-        self.ada = ADAInterface()
+        # Warm the shared scenario cache so dropdown switches never hit disk
+        scenario_cache.prefetch(background=True)
+        self.ada = ADAInterface(silent=silent)
         self.simulator = RealitySimulator()
         self.data_loader = RealWorldDataLoader(self.ada.current_scenario)
+        self.target_rate = 1.0
+        self.stop_event = threading.Event()
+        self.worker = None
+        self.results = queue.Queue(maxsize=RESULT_QUEUE_SIZE)
+        self.iteration_times = []
+        self.stage_latency = {}
         self.create_widgets()
 
     def create_widgets(self):
@@ -121,6 +55,17 @@ class QuantumSimulationApp:
         self.scenario_menu = tk.OptionMenu(self.root, self.selected_scenario, *self.scenario_options, command=self.update_scenario)
         self.scenario_menu.pack(pady=5)
 
+        self.rate_label = tk.Label(self.root, text="Target rate (iterations/sec):")
+        self.rate_label.pack()
+        self.rate_var = tk.StringVar(self.root, value=str(self.target_rate))
+        self.rate_spinbox = tk.Spinbox(self.root, from_=0.1, to=1000, increment=0.5, width=8,
+                                       textvariable=self.rate_var, command=self.update_rate)
+        self.rate_spinbox.bind("<Return>", lambda event: self.update_rate())
+        self.rate_spinbox.pack(pady=5)
+
+        self.performance_label = tk.Label(self.root, text="Throughput: idle", justify="left")
+        self.performance_label.pack(pady=5)
+
         self.quantum_output_label = tk.Label(self.root, text="Quantum Output: ", justify="left")
         self.quantum_output_label.pack(pady=5)
 
@@ -143,24 +88,130 @@ class QuantumSimulationApp:
         self.ada.current_scenario = value
         self.data_loader = RealWorldDataLoader(value)
         self.scenario_label.config(text=f"Scenario: {value}")
-        self.ada.speak(f"Scenario updated to {value}")
+        self.ada.speak(f"Scenario updated to {value}", coalesce_key="Scenario Update")
+
+    def update_rate(self):
+        try:
+            self.target_rate = max(0.1, float(self.rate_var.get()))
+        except ValueError:
+            self.rate_var.set(str(self.target_rate))
 
     def start_simulation(self):
         self.start_button.config(state=tk.DISABLED)
         self.stop_button.config(state=tk.NORMAL)
-        input_data = self.data_loader.get_simulation_input()
-        self.display_quantum_output(input_data)
-        ada_response = self.ada.analyze(input_data)
-        self.display_ada_analysis(ada_response)
-        result = self.simulator.nudge_probability(ada_response)
-        self.display_reality_result(result)
-        self.display_multi_goal_status(ada_response['multi_objective_summary'])
-        self.real_time_interaction(ada_response)
+        self.update_rate()
+        self.stop_event = threading.Event()
+        # A fresh queue per run, so a previous worker still finishing its
+        # last iteration cannot leak stale results into this one
+        self.results = queue.Queue(maxsize=RESULT_QUEUE_SIZE)
+        self.iteration_times = []
+        self.stage_latency = {}
+        self.worker = threading.Thread(target=self.run_pipeline_loop, args=(self.stop_event, self.results), daemon=True)
+        self.worker.start()
+        self.root.after(UI_REFRESH_MS, self.drain_results, self.stop_event, self.results)
 
     def stop_simulation(self):
+        self.stop_event.set()
+        self.reset_buttons()
+        self.ada_interaction_text.delete(1.0, tk.END)
+        self.performance_label.config(text="Throughput: idle")
+
+    def reset_buttons(self):
         self.start_button.config(state=tk.NORMAL)
         self.stop_button.config(state=tk.DISABLED)
-        self.ada_interaction_text.delete(1.0, tk.END)
+
+    def run_pipeline_once(self):
+        # Runs on the worker thread; must not touch Tk widgets
+        timings = {}
+        start = time.perf_counter()
+        input_data = self.data_loader.get_simulation_input()
+        timings["load"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ada_response = self.ada.analyze(input_data)
+        timings["analyze"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = self.simulator.nudge_probability(ada_response)
+        timings["nudge"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        self.ada.speak(f"Scenario Evaluation: {ada_response['goal_evaluation']}", coalesce_key="Scenario Evaluation")
+        timings["speak"] = time.perf_counter() - start
+        return input_data, ada_response, result, timings, time.perf_counter()
+
+    @staticmethod
+    def publish(results, item):
+        try:
+            results.put_nowait(item)
+        except queue.Full:
+            # The UI only renders the newest result, so drop the oldest
+            try:
+                results.get_nowait()
+            except queue.Empty:
+                pass
+            results.put_nowait(item)
+
+    def run_pipeline_loop(self, stop_event, results):
+        while not stop_event.is_set():
+            started = time.perf_counter()
+            try:
+                iteration = self.run_pipeline_once()
+            except Exception as e:
+                logging.exception(f"Simulation iteration failed: {e}")
+                # The exception itself tells the UI that the worker has exited
+                self.publish(results, e)
+                break
+            self.publish(results, iteration)
+            # Waiting on the event lets Stop cancel the pause immediately
+            stop_event.wait(max(0.0, 1.0 / self.target_rate - (time.perf_counter() - started)))
+
+    def drain_results(self, stop_event, results):
+        # stop_event and results belong to the run that scheduled this
+        # callback; once it is stopped, a later run's state is not ours to touch
+        if stop_event.is_set():
+            return
+        latest = None
+        error = None
+        now = time.perf_counter()
+        while True:
+            try:
+                item = results.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(item, Exception):
+                error = item
+                break
+            latest = item
+            self.iteration_times.append(latest[4])
+            for stage, seconds in latest[3].items():
+                previous = self.stage_latency.get(stage, seconds)
+                self.stage_latency[stage] = 0.8 * previous + 0.2 * seconds
+
+        # Coalesce: however many iterations finished, redraw once with the newest
+        if latest is not None:
+            input_data, ada_response, result = latest[:3]
+            self.display_quantum_output(input_data)
+            self.display_ada_analysis(ada_response)
+            self.display_reality_result(result)
+            self.display_multi_goal_status(ada_response['multi_objective_summary'])
+            self.real_time_interaction(ada_response)
+
+        if error is not None:
+            stop_event.set()
+            self.reset_buttons()
+            self.performance_label.config(text=f"Simulation stopped: {error}")
+            return
+        self.iteration_times = [t for t in self.iteration_times if now - t <= 5.0]
+        self.display_performance()
+        self.root.after(UI_REFRESH_MS, self.drain_results, stop_event, results)
+
+    def display_performance(self):
+        window = self.iteration_times
+        rate = (len(window) - 1) / (window[-1] - window[0]) if len(window) > 1 and window[-1] > window[0] else 0.0
+        stages = " | ".join(f"{stage} {self.stage_latency[stage] * 1000:.1f} ms"
+                            for stage in PIPELINE_STAGES if stage in self.stage_latency)
+        self.performance_label.config(text=f"Throughput: {rate:.1f} it/s | {stages}")
 
     def display_quantum_output(self, output):
         self.quantum_output_label.config(text=f"Quantum Output: {output}")
@@ -183,11 +234,8 @@ class QuantumSimulationApp:
         msg = f"Scenario Evaluation: {ada_response['goal_evaluation']}"
         self.ada_interaction_text.insert(tk.END, f"{msg}\n")
         self.ada_interaction_text.yview(tk.END)
-        self.ada.speak(msg)
-        time.sleep(1)
-        self.root.update()
 
 if __name__ == "__main__":
     root = tk.Tk()
-    app = QuantumSimulationApp(root)
+    app = QuantumSimulationApp(root, silent="--silent" in sys.argv)
     root.mainloop()
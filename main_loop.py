@@ -1,7 +1,12 @@
-import time
-from flask import Flask
+import argparse
+import asyncio
+import os
+from flask import Flask, Response, jsonify
 import threading
 from ada_neural_core import ADAEngine  # Make sure this import matches the correct path
+from instrumentation import registry, PROMETHEUS_CONTENT_TYPE
+from campaign_scheduler import Campaign, CampaignScheduler, SimulatedClock
+from ai_ada_engine.donation_ledger import DonationLedger
 
 # Initialize Flask app
 app = Flask(__name__)
@@ -10,39 +15,80 @@ app = Flask(__name__)
 def home():
     return "Webhook listener is live!"
 
+@app.route('/metrics')
+def metrics():
+    return Response(registry.render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+# Campaign progress set by run_nudge_cycle; /status reads the running totals
+# from it. Real webhook donations live in the engine's own ledger instead.
+ledger = None
+
+@app.route('/status')
+def status():
+    if ledger is None:
+        return jsonify({'status': 'starting'}), 503
+    return jsonify(ledger.summary())
+
 def run_flask():
     app.run(debug=True, use_reloader=False, host="0.0.0.0", port=5000)
 
-def run_nudge_cycle():
-    target_funding_goal = 100_000_000_000
-    cumulative_donations = 0
+DEFAULT_INTERVAL = 600  # seconds between nudge cycles
+DEFAULT_FUNDING_GOAL = 100_000_000_000
 
-    # Create an instance of ADAEngine (you can replace this with ADAHyperdonorInterface if needed)
-    ada = ADAEngine()
+def make_campaign(ada, donation_ledger, name="hyperdonor", interval=DEFAULT_INTERVAL, funding_goal=DEFAULT_FUNDING_GOAL):
+    def step(campaign):
+        # Run the hyperdonor campaign with the ADA engine (no simulation)
+        high_prob_df = ada.run_simulation()
+        # Record the donations; progress toward the goal is read back from the ledger
+        donations = list(zip(high_prob_df['name'], high_prob_df['predicted_donation'], [name] * len(high_prob_df)))
+        donation_ledger.record_many(donations)
+        return high_prob_df['predicted_donation'].sum()
 
-    while cumulative_donations < target_funding_goal:
-        # Simulate the campaign (this should now use the real webhook data)
-        print("\n=== Iteration ===")
+    def report(campaign, donations):
+        print(f"\n=== Iteration {campaign.iterations} ({campaign.name}) ===")
         print("Hyperdonor Campaign Simulation Results:")
+        print(f"Total Donations (with >85% probability): ${campaign.cumulative_donations:,.2f}")
+        print("[ADA] Nudge Deployed (visionary): Support a project shaping ethical influence — not by control, but by cognitive resonance.")
 
-        # Run the hyperdonor campaign with the ADA engine (no simulation)
-        high_prob_df = ada.run_simulation()  # Ensure ADAEngine has the run_simulation method
-
-        # Calculate total donations based on the probability
-        donations_this_iter = high_prob_df['predicted_donation'].sum()
-        cumulative_donations += donations_this_iter
+    return Campaign(name, step, interval=interval, funding_goal=funding_goal, on_iteration=report,
+                    progress=lambda: donation_ledger.source_total(name))
 
-        print(f"Total Donations (with >85% probability): ${cumulative_donations:,.2f}")
-        print("[ADA] Nudge Deployed (visionary): Support a project shaping ethical influence — not by control, but by cognitive resonance.")
-        
-        # Sleep for 10 minutes (600 seconds)
-        time.sleep(600)
+def run_nudge_cycle(campaigns=None, clock=None, duration=None, donation_ledger=None):
+    """
+    Run the campaigns concurrently until each meets its funding goal,
+    `duration` clock seconds elapse, or SIGINT/SIGTERM. With a
+    SimulatedClock the sleeps between cycles take no wall time.
+    Predicted campaign donations go to donation_ledger, an in-memory ledger
+    by default, so they never mix with real donations in ada.ledger and
+    each run starts from zero.
+    """
+    global ledger
+    scheduler = CampaignScheduler(clock)
+    if campaigns is None:
+        # Create an instance of ADAEngine (you can replace this with ADAHyperdonorInterface if needed)
+        ada = ADAEngine(warm_up=os.environ.get("ADA_WARMUP") == "1")
+        if donation_ledger is None:
+            donation_ledger = DonationLedger(journal_path=None)
+        campaigns = [make_campaign(ada, donation_ledger)]
+    ledger = donation_ledger
+    for campaign in campaigns:
+        scheduler.add(campaign)
+    return asyncio.run(scheduler.run(duration=duration))
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the nudge campaigns next to the webhook listener.")
+    parser.add_argument("--simulate-days", type=float, help="fast-forward this many days on a simulated clock")
+    args = parser.parse_args()
+
     # Start Flask app in a separate thread
     flask_thread = threading.Thread(target=run_flask)
     flask_thread.daemon = True  # Allow the thread to exit when the main program exits
     flask_thread.start()
 
     # Start the nudge cycle
-    run_nudge_cycle()
+    if args.simulate_days:
+        summaries = run_nudge_cycle(clock=SimulatedClock(), duration=args.simulate_days * 86400)
+    else:
+        summaries = run_nudge_cycle()
+    for summary in summaries:
+        print(f"[Scheduler] {summary['name']}: {summary['iterations']} cycles, ${summary['cumulative_donations']:,.2f} raised")
@@ -1,48 +1,107 @@
-
 import random
 import datetime
+from collections import deque
+
+NUDGE_MESSAGES = {
+    "emotional": "Imagine if your next act of kindness wasn't chance — but destiny shaped by quantum alignment.",
+    "technical": "We're testing probabilistic quantum reinforcement across multiversal decision trees. Want to see it in action?",
+    "spiritual": "If thoughts are echoes across realities, what does intention mean in a quantum multiverse?",
+    "visionary": "Support a project shaping ethical influence — not by control, but by cognitive resonance."
+}
+
+# Only the most recent nudges are kept for get_recent_nudges
+HISTORY_SIZE = 1000
+
+class AliasSampler:
+    """
+    Walker/Vose alias table: O(n) to build, O(1) per weighted draw.
+    """
+    def __init__(self, weights):
+        n = len(weights)
+        total = sum(weights)
+        scaled = [w * n / total for w in weights]
+        self.prob = [0.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            self.prob[s] = scaled[s]
+            self.alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        for i in small + large:
+            self.prob[i] = 1.0
+        self.n = n
+
+    def sample(self, rng=random):
+        i = int(rng.random() * self.n)
+        return i if rng.random() < self.prob[i] else self.alias[i]
 
 class NudgeScheduler:
-    def __init__(self):
-        self.nudge_history = []
+    def __init__(self, history_size=HISTORY_SIZE):
+        self.nudge_history = deque(maxlen=history_size)
         self.nudge_weights = {
             "emotional": 1.0,
             "technical": 1.0,
             "spiritual": 1.0,
             "visionary": 1.0
         }
+        self.messages = dict(NUDGE_MESSAGES)
+        self.sampler = None
+        self.sampler_types = None
+
+    def get_sampler(self):
+        # Rebuilt lazily, and only after update_weights/add_nudge_type changed something
+        if self.sampler is None:
+            self.sampler_types = list(self.nudge_weights)
+            self.sampler = AliasSampler([self.nudge_weights[t] for t in self.sampler_types])
+        return self.sampler
 
     def generate_nudge(self):
         # Choose nudge type based on weighted probability
-        total_weight = sum(self.nudge_weights.values())
-        rand_val = random.uniform(0, total_weight)
-        cumulative = 0
-        for nudge_type, weight in self.nudge_weights.items():
-            cumulative += weight
-            if rand_val <= cumulative:
-                return self.create_nudge(nudge_type)
+        sampler = self.get_sampler()
+        return self.create_nudge(self.sampler_types[sampler.sample()])
+
+    def generate_nudges(self, n):
+        sampler = self.get_sampler()
+        types = self.sampler_types
+        timestamp = datetime.datetime.utcnow().isoformat()
+        nudges = []
+        for _ in range(n):
+            type_ = types[sampler.sample()]
+            nudges.append({
+                "timestamp": timestamp,
+                "type": type_,
+                "message": self.messages[type_]
+            })
+        self.nudge_history.extend(nudges)
+        return nudges
 
     def create_nudge(self, type_):
         timestamp = datetime.datetime.utcnow().isoformat()
-        message = {
-            "emotional": "Imagine if your next act of kindness wasn't chance — but destiny shaped by quantum alignment.",
-            "technical": "We're testing probabilistic quantum reinforcement across multiversal decision trees. Want to see it in action?",
-            "spiritual": "If thoughts are echoes across realities, what does intention mean in a quantum multiverse?",
-            "visionary": "Support a project shaping ethical influence — not by control, but by cognitive resonance."
-        }[type_]
         nudge = {
             "timestamp": timestamp,
             "type": type_,
-            "message": message
+            "message": self.messages[type_]
         }
         self.nudge_history.append(nudge)
         return nudge
 
+    def add_nudge_type(self, type_, message, weight=1.0):
+        self.messages[type_] = message
+        self.nudge_weights[type_] = max(0.1, weight)
+        self.sampler = None
+
     def update_weights(self, feedback):
         # Example feedback: {"emotional": +0.2, "technical": -0.1}
         for k, v in feedback.items():
             if k in self.nudge_weights:
-                self.nudge_weights[k] = max(0.1, self.nudge_weights[k] + v)
+                new_weight = max(0.1, self.nudge_weights[k] + v)
+                if new_weight != self.nudge_weights[k]:
+                    self.nudge_weights[k] = new_weight
+                    self.sampler = None
 
     def get_recent_nudges(self, limit=5):
-        return self.nudge_history[-limit:]
+        count = min(limit, len(self.nudge_history))
+        return [self.nudge_history[-i] for i in range(count, 0, -1)]
@@ -1,6 +1,8 @@
 import random
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
+from scipy import sparse
 
 
 # Define high-net-worth individuals and their basic profiles
@@ -12,6 +14,113 @@ HNWI_LIST = [
     {"name": "MacKenzie Scott", "net_worth": 30_000_000_000, "interests": ["education", "gender equality", "philanthropy"]},
 ]
 
+# Influencers whose success reinforces every other profile: while their
+# probability_of_success exceeds `threshold`, everyone else gains `boost`
+INFLUENCERS = [
+    {"name": "Elon Musk", "boost": 0.03, "threshold": 0.85},
+    {"name": "Warren Buffett", "boost": 0.02, "threshold": 0.85},
+]
+
+MAX_PROBABILITY = 0.99
+
+class InfluenceGraph:
+    """
+    Sparse influence graph: weights[i, j] is the probability boost profile i
+    receives while profile j is active, i.e. while its probability of
+    success is above thresholds[j]. Profiles that influence nobody have an
+    infinite threshold.
+    """
+    def __init__(self, weights, thresholds):
+        self.weights = sparse.csr_matrix(weights)
+        self.thresholds = np.asarray(thresholds, dtype=float)
+
+    @classmethod
+    def from_edges(cls, size, sources, targets, weights, thresholds):
+        matrix = sparse.coo_matrix((weights, (targets, sources)), shape=(size, size))
+        return cls(matrix.tocsr(), thresholds)
+
+    @classmethod
+    def from_influencers(cls, names, influencers=INFLUENCERS):
+        names = list(names)
+        size = len(names)
+        index = {name: i for i, name in enumerate(names)}
+        thresholds = np.full(size, np.inf)
+        sources, targets, weights = [], [], []
+        everyone = np.arange(size)
+        for influencer in influencers:
+            j = index.get(influencer["name"])
+            if j is None:
+                continue
+            thresholds[j] = influencer["threshold"]
+            others = everyone[everyone != j]
+            sources.append(np.full(len(others), j))
+            targets.append(others)
+            weights.append(np.full(len(others), influencer["boost"]))
+        if not sources:
+            return cls(sparse.csr_matrix((size, size)), thresholds)
+        return cls.from_edges(size, np.concatenate(sources), np.concatenate(targets),
+                              np.concatenate(weights), thresholds)
+
+    def boosts(self, probabilities, hops=1, max_hops=100):
+        """
+        Total boost per profile (rows of a 2-D array are independent
+        trials). hops=1 uses only the initial probabilities;
+        larger values (or None, meaning until a fixed point) let boosted
+        profiles activate and pass influence on.
+        """
+        probabilities = np.asarray(probabilities, dtype=float)
+        active = probabilities > self.thresholds
+        boost = self.propagate(active)
+        for _ in range(1, max_hops if hops is None else hops):
+            next_active = np.minimum(MAX_PROBABILITY, probabilities + boost) > self.thresholds
+            if np.array_equal(next_active, active):
+                break
+            active = next_active
+            boost = self.propagate(active)
+        return boost
+
+    def propagate(self, active):
+        # active is (profiles,) or (trials, profiles)
+        if active.ndim == 1:
+            return self.weights @ active.astype(float)
+        return (self.weights @ active.T.astype(float)).T
+
+    def reinforce(self, probabilities, donations, hops=1):
+        """
+        Vectorized reinforcement; returns (probabilities, donations, boost).
+        """
+        boost = self.boosts(probabilities, hops)
+        reinforced_probabilities = np.minimum(MAX_PROBABILITY, np.asarray(probabilities, dtype=float) + boost)
+        reinforced_donations = np.round(np.asarray(donations, dtype=float) * (1 + boost * 2), -6)
+        return reinforced_probabilities, reinforced_donations, boost
+
+def generate_synthetic_population(size, avg_degree=5, influencer_fraction=0.01, seed=None):
+    """
+    Random population of `size` profiles with a sparse influence graph in
+    which a small fraction of influencers each reach many profiles.
+    Returns (population columns, InfluenceGraph).
+    """
+    rng = np.random.default_rng(seed)
+    net_worth = np.round(10 ** rng.uniform(8, 11.5, size), -6)
+    population = {
+        "net_worth": net_worth,
+        "predicted_donation": np.round(rng.uniform(0.01, 0.1, size) * net_worth, -6),
+        "probability_of_success": np.round(rng.uniform(0.6, 0.98, size), 2)
+    }
+
+    num_influencers = max(1, int(size * influencer_fraction))
+    influencers = rng.choice(size, num_influencers, replace=False)
+    thresholds = np.full(size, np.inf)
+    thresholds[influencers] = rng.uniform(0.8, 0.9, num_influencers)
+
+    num_edges = size * avg_degree
+    sources = influencers[rng.integers(num_influencers, size=num_edges)]
+    targets = rng.integers(size, size=num_edges)
+    keep = sources != targets
+    weights = rng.uniform(0.002, 0.01, keep.sum())
+    graph = InfluenceGraph.from_edges(size, sources[keep], targets[keep], weights, thresholds)
+    return population, graph
+
 # Generate influence profile for each individual
 def generate_influence_profile(hnwi):
     return {
@@ -25,17 +134,18 @@ def generate_influence_profile(hnwi):
     }
 
 # Apply social reinforcement based on simulated influence
-def reinforce_profiles(profiles):
+def reinforce_profiles(profiles, graph=None, hops=1):
+    if not profiles:
+        return []
+    if graph is None:
+        graph = InfluenceGraph.from_influencers(p["name"] for p in profiles)
+    probabilities = np.array([p["probability_of_success"] for p in profiles], dtype=float)
+    boost = graph.boosts(probabilities, hops)
     reinforced = []
-    for profile in profiles:
+    for profile, extra in zip(profiles, boost.tolist()):
         updated = profile.copy()
-        boost = 0.0
-        if profile["name"] != "Elon Musk" and any(p["name"] == "Elon Musk" and p["probability_of_success"] > 0.85 for p in profiles):
-            boost += 0.03
-        if profile["name"] != "Warren Buffett" and any(p["name"] == "Warren Buffett" and p["probability_of_success"] > 0.85 for p in profiles):
-            boost += 0.02
-        updated["probability_of_success"] = min(0.99, updated["probability_of_success"] + boost)
-        updated["predicted_donation"] = round(updated["predicted_donation"] * (1 + boost * 2), -6)
+        updated["probability_of_success"] = min(MAX_PROBABILITY, updated["probability_of_success"] + extra)
+        updated["predicted_donation"] = round(updated["predicted_donation"] * (1 + extra * 2), -6)
         reinforced.append(updated)
     return reinforced
 
@@ -55,6 +165,42 @@ def simulate_hyperdonor_campaign():
 
     return df, total_donations
 
+# Funding levels reported by simulate_hyperdonor_monte_carlo as P(total >= goal)
+DEFAULT_FUNDING_GOALS = (1_000_000_000, 10_000_000_000, 50_000_000_000, 100_000_000_000)
+
+def simulate_hyperdonor_monte_carlo(trials=10_000, threshold=0.85, hnwi_list=HNWI_LIST, graph=None, hops=1,
+                                    percentiles=(5, 25, 50, 75, 95), goals=DEFAULT_FUNDING_GOALS, seed=None,
+                                    return_totals=False):
+    """
+    Vectorized Monte Carlo version of simulate_hyperdonor_campaign: draws
+    trials x profiles arrays at once and summarizes the distribution of
+    total_donations (only profiles above `threshold` count).
+    """
+    rng = np.random.default_rng(seed)
+    net_worth = np.array([h["net_worth"] for h in hnwi_list], dtype=float)
+    shape = (trials, len(net_worth))
+    donations = np.round(rng.uniform(0.01, 0.1, shape) * net_worth, -6)
+    probabilities = np.round(rng.uniform(0.6, 0.98, shape), 2)
+
+    if graph is None:
+        graph = InfluenceGraph.from_influencers(h["name"] for h in hnwi_list)
+    probabilities, donations, _ = graph.reinforce(probabilities, donations, hops)
+
+    totals = np.where(probabilities > threshold, donations, 0.0).sum(axis=1)
+    summary = {
+        "trials": trials,
+        "mean": float(totals.mean()),
+        "std": float(totals.std()),
+        "min": float(totals.min()),
+        "max": float(totals.max()),
+        "percentiles": dict(zip(percentiles, np.percentile(totals, percentiles).tolist())),
+        "tail_probabilities": {goal: float((totals >= goal).mean()) for goal in goals},
+        "probability_of_zero": float((totals == 0).mean())
+    }
+    if return_totals:
+        summary["totals"] = totals
+    return summary
+
 if __name__ == "__main__":
     df, total = simulate_hyperdonor_campaign()
     print("Projected Donations Over 85% Confidence Threshold:")
@@ -1,27 +1,111 @@
 # hex_formula_sim.py
 
-from qiskit import QuantumCircuit, Aer, transpile, assemble, execute
+from qiskit import QuantumCircuit, Aer, transpile
+from qiskit.circuit import Parameter
 import numpy as np
 import logging
+import threading
 from scipy.stats import entropy
+from instrumentation import timed
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def build_entangled_circuit(num_qubits=2, depth=1):
+SCENARIO_WEIGHTS = {
+    "Prevent Ecological Collapse": 1.15,
+    "Stabilize Global Markets": 1.05,
+    "Enhance Cognitive Evolution": 1.2,
+    "Minimize Existential Risk": 1.1
+}
+
+# Measurement outcomes in Qiskit's little-endian order ("q1 q0")
+BITSTRINGS = ['00', '01', '10', '11']
+
+# Transpiled parameterized templates keyed by (num_qubits, depth, backend)
+_circuit_cache = {}
+_backend_cache = {}
+_cache_lock = threading.Lock()
+circuit_cache_stats = {'hits': 0, 'misses': 0}
+
+def build_entangled_circuit(num_qubits=2, depth=1, angles=None):
     """
     Create a basic entangled quantum circuit with optional depth layers.
+    angles: optional (depth, 2) array of (rx, ry) rotation angles; drawn
+    uniformly from [0, pi) when omitted.
     """
+    if angles is None:
+        angles = [(np.random.uniform(0, np.pi), np.random.uniform(0, np.pi)) for _ in range(depth)]
     qc = QuantumCircuit(num_qubits)
     qc.h(0)
     qc.cx(0, 1)
-    for _ in range(depth):
-        qc.rx(np.random.uniform(0, np.pi), 0)
-        qc.ry(np.random.uniform(0, np.pi), 1)
+    for theta, phi in angles:
+        qc.rx(theta, 0)
+        qc.ry(phi, 1)
         qc.cz(0, 1)
     qc.measure_all()
     return qc
 
+def build_parameterized_circuit(num_qubits=2, depth=1):
+    """
+    Same layout as build_entangled_circuit, but with symbolic rotation angles.
+    Returns the circuit and its parameters as a list of (theta, phi) per layer.
+    """
+    params = [(Parameter(f'theta_{i}'), Parameter(f'phi_{i}')) for i in range(depth)]
+    return build_entangled_circuit(num_qubits, depth, angles=params), params
+
+def get_backend(backend_name='qasm_simulator'):
+    """
+    Fetch an Aer backend once per process.
+    """
+    with _cache_lock:
+        if backend_name not in _backend_cache:
+            _backend_cache[backend_name] = Aer.get_backend(backend_name)
+        return _backend_cache[backend_name]
+
+def get_cached_circuit(num_qubits=2, depth=1, backend_name='qasm_simulator'):
+    """
+    Return (transpiled_template, params) for the given shape, transpiling the
+    parameterized circuit only on the first request.
+    """
+    key = (num_qubits, depth, backend_name)
+    with _cache_lock:
+        entry = _circuit_cache.get(key)
+        if entry is not None:
+            circuit_cache_stats['hits'] += 1
+            return entry
+        circuit_cache_stats['misses'] += 1
+    backend = get_backend(backend_name)
+    qc, params = build_parameterized_circuit(num_qubits, depth)
+    entry = (transpile(qc, backend), params)
+    with _cache_lock:
+        return _circuit_cache.setdefault(key, entry)
+
+def circuit_cache_info():
+    """
+    Hit/miss counters and current size of the circuit cache.
+    """
+    with _cache_lock:
+        return dict(circuit_cache_stats, size=len(_circuit_cache))
+
+def clear_circuit_cache():
+    with _cache_lock:
+        _circuit_cache.clear()
+        circuit_cache_stats['hits'] = circuit_cache_stats['misses'] = 0
+
+def run_bound_circuits(angles, num_qubits=2, shots=1024, backend_name='qasm_simulator'):
+    """
+    Bind every (depth, 2) angle set in angles onto the cached template and run
+    them all as a single backend job. Returns one counts dict per angle set.
+    """
+    angles = np.asarray(angles, dtype=float)
+    template, params = get_cached_circuit(num_qubits, angles.shape[1], backend_name)
+    binds = {}
+    for layer, (theta, phi) in enumerate(params):
+        binds[theta] = angles[:, layer, 0].tolist()
+        binds[phi] = angles[:, layer, 1].tolist()
+    result = get_backend(backend_name).run(template, shots=shots, parameter_binds=[binds]).result()
+    return [result.get_counts(i) for i in range(angles.shape[0])]
+
 def generate_simulation_metrics():
     """
     Generate simulated metrics representing quantum reality parameters.
@@ -46,29 +130,18 @@ def scenario_weight_adjustments(scenario, entropy_value, info_flow):
     """
     Adjust entropy based on scenario-specific weights.
     """
-    weight_map = {
-        "Prevent Ecological Collapse": 1.15,
-        "Stabilize Global Markets": 1.05,
-        "Enhance Cognitive Evolution": 1.2,
-        "Minimize Existential Risk": 1.1
-    }
-    weight = weight_map.get(scenario, 1.0)
+    weight = SCENARIO_WEIGHTS.get(scenario, 1.0)
     adjusted_entropy = round(entropy_value * weight, 4)
     variance = np.abs(info_flow[0] - info_flow[1])
     return adjusted_entropy, variance
 
+@timed("quantum")
 def run_quantum_simulation(depth=1, scenario="Prevent Ecological Collapse"):
     """
     Run the quantum simulation and return metrics and results.
     """
-    qc = build_entangled_circuit(depth=depth)
-    simulator = Aer.get_backend('qasm_simulator')
-
-    transpiled_qc = transpile(qc, simulator)
-    qobj = assemble(transpiled_qc)
-
-    result = execute(qc, simulator, shots=1024).result()
-    counts = result.get_counts()
+    angles = np.random.uniform(0, np.pi, size=(1, depth, 2))
+    counts = run_bound_circuits(angles)[0]
 
     entanglement_density, phase_alignment, information_flow = generate_simulation_metrics()
     entropy_value = compute_shannon_entropy(counts)
@@ -88,5 +161,110 @@ def run_quantum_simulation(depth=1, scenario="Prevent Ecological Collapse"):
         }
     }
 
-    logging.info(f"Quantum Output: {quantum_output}")
+    # Lazy %-formatting: the dict is only rendered if INFO is actually emitted
+    logging.info("Quantum Output: %s", quantum_output)
     return quantum_output
+
+
+def generate_simulation_metrics_batch(n, rng):
+    """
+    Vectorized generate_simulation_metrics: draw n metric sets at once.
+    """
+    entanglement_density = np.round(rng.uniform(0.4, 0.6, n), 4)
+    phase_alignment = np.round(rng.uniform(0.4, 0.6, n), 4)
+    information_flow = np.column_stack([
+        rng.integers(480, 560, n),
+        rng.integers(440, 520, n)
+    ])
+    return entanglement_density, phase_alignment, information_flow
+
+def simulate_statevectors(angles):
+    """
+    Exact NumPy statevector simulation of build_entangled_circuit for a batch
+    of circuits. angles has shape (n, depth, 2); returns outcome probabilities
+    of shape (n, 4) ordered as BITSTRINGS.
+    """
+    n = angles.shape[0]
+    # state[k, q1, q0]; H on q0 followed by CX(0, 1) gives the Bell state
+    state = np.zeros((n, 2, 2), dtype=np.complex128)
+    state[:, 0, 0] = state[:, 1, 1] = 1 / np.sqrt(2)
+    for layer in range(angles.shape[1]):
+        half_theta = angles[:, layer, 0, None] / 2
+        c, s = np.cos(half_theta), np.sin(half_theta)
+        a0, a1 = state[:, :, 0].copy(), state[:, :, 1].copy()
+        state[:, :, 0] = c * a0 - 1j * s * a1
+        state[:, :, 1] = -1j * s * a0 + c * a1
+
+        half_phi = angles[:, layer, 1, None] / 2
+        c, s = np.cos(half_phi), np.sin(half_phi)
+        b0, b1 = state[:, 0, :].copy(), state[:, 1, :].copy()
+        state[:, 0, :] = c * b0 - s * b1
+        state[:, 1, :] = s * b0 + c * b1
+
+        state[:, 1, 1] *= -1
+    return np.abs(state.reshape(n, 4)) ** 2
+
+def run_circuits_qiskit(angles, shots=1024):
+    """
+    Cross-check backend: run the batch through Aer as one parameter-bound job
+    and return counts of shape (n, 4) ordered as BITSTRINGS.
+    """
+    results = run_bound_circuits(angles, shots=shots)
+    return np.array([[result.get(b, 0) for b in BITSTRINGS] for result in results], dtype=np.int64)
+
+def compute_shannon_entropy_batch(probs):
+    """
+    Row-wise Shannon entropy (base 2) of an (n, k) probability array.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(probs > 0, probs * np.log2(probs), 0.0)
+    return -terms.sum(axis=1)
+
+@timed("quantum_ensemble")
+def run_quantum_ensemble(n, depth=1, scenario="Prevent Ecological Collapse", shots=1024, backend="numpy", seed=None):
+    """
+    Run n random-angle simulations at once and return columnar arrays.
+    backend="numpy" uses the exact statevector engine, "qiskit" runs every
+    circuit through Aer as a cross-check. shots=None returns exact
+    probabilities (numpy backend only) instead of sampled counts.
+    """
+    rng = np.random.default_rng(seed)
+    angles = rng.uniform(0, np.pi, size=(n, depth, 2))
+
+    if backend == "numpy":
+        probs = simulate_statevectors(angles)
+        if shots is None:
+            counts = None
+        else:
+            probs = np.clip(probs, 0.0, None)
+            probs /= probs.sum(axis=1, keepdims=True)
+            counts = rng.multinomial(shots, probs)
+            probs = counts / shots
+    elif backend == "qiskit":
+        if shots is None:
+            raise ValueError("The qiskit backend requires a shot count")
+        counts = run_circuits_qiskit(angles, shots=shots)
+        probs = counts / shots
+    else:
+        raise ValueError(f"Unknown ensemble backend: {backend}")
+
+    entanglement_density, phase_alignment, information_flow = generate_simulation_metrics_batch(n, rng)
+    entropy_values = compute_shannon_entropy_batch(probs)
+    weight = SCENARIO_WEIGHTS.get(scenario, 1.0)
+
+    return {
+        'bitstrings': BITSTRINGS,
+        'angles': angles,
+        'entanglement_density': entanglement_density,
+        'phase_alignment': phase_alignment,
+        'information_flow': information_flow,
+        'measurement_counts': counts,
+        'probabilities': probs,
+        'entropy': np.round(entropy_values, 4),
+        'adjusted_entropy': np.round(entropy_values * weight, 4),
+        'scenario_relevance': {
+            'ecology_factor': np.round(entanglement_density * 1.2 - phase_alignment, 3),
+            'market_variance': np.abs(information_flow[:, 0] - information_flow[:, 1]),
+            'cognitive_signal_strength': np.round(phase_alignment * 0.9, 3)
+        }
+    }
@@ -1,6 +1,16 @@
+import numpy as np
+
+# Outcome messages indexed by the codes nudge_probability_batch returns
+NUDGE_OUTCOMES = (
+    "Insufficient coherence to alter reality.",
+    "Probability fields nudged. Minor ripple in outcome likelihood.",
+    "Local quantum field altered. Observable effect expected."
+)
+
 class RealitySimulator:
-    def __init__(self):
-        print("Reality Simulator Ready.\n")
+    def __init__(self, verbose=True):
+        if verbose:
+            print("Reality Simulator Ready.\n")
 
     def nudge_probability(self, ada_response):
         score = ada_response["influence_score"]
@@ -11,3 +21,7 @@ class RealitySimulator:
         else:
             return "Insufficient coherence to alter reality."
 
+    def nudge_probability_batch(self, influence_scores):
+        # Same thresholds as nudge_probability, as uint8 codes into NUDGE_OUTCOMES
+        scores = np.asarray(influence_scores)
+        return (scores > 0.75).astype(np.uint8) + (scores > 0.9).astype(np.uint8)
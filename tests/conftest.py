@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The project is a set of top-level scripts and namespace packages, not an
+# installed package; make them importable from the tests
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,26 @@
+import numpy as np
+from ai_ada_engine.q_learning import QLearningEngine
+
+def test_update_batch_matches_sequential_updates_for_distinct_cells():
+    batched = QLearningEngine(4, 2)
+    sequential = QLearningEngine(4, 2)
+    transitions = [(0, 1, 1.0, 1), (1, 0, 2.0, 2), (2, 1, 3.0, 3)]
+    batched.update_batch(*map(np.array, zip(*transitions)))
+    for state, action, reward, next_state in transitions:
+        sequential.update(state, action, reward, next_state)
+    np.testing.assert_allclose(batched.q_table, sequential.q_table)
+
+def test_duplicate_transitions_take_one_step():
+    engine = QLearningEngine(4, 2, learning_rate=0.1)
+    engine.update_batch(np.zeros(200, dtype=int), np.zeros(200, dtype=int), np.ones(200), np.zeros(200, dtype=int))
+    assert engine.q_table[0, 0] == np.float32(0.1)
+
+def test_repeated_replay_stays_bounded():
+    # With rewards in [-1, 1] no Q value can exceed 1 / (1 - discount_factor)
+    engine = QLearningEngine(4, 2, discount_factor=0.9, batch_size=256, seed=0)
+    for _ in range(200):
+        engine.observe(0, 0, 1.0, 0)
+        engine.observe(1, 1, -1.0, 0)
+    for _ in range(500):
+        engine.replay()
+    assert np.abs(engine.q_table).max() <= 1 / (1 - 0.9) + 1e-3
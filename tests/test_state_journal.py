@@ -0,0 +1,25 @@
+import numpy as np
+from ai_ada_engine import ada_neural_core
+from ai_ada_engine.ada_neural_core import ADAEngine
+
+def quantum(entanglement):
+    return {'entanglement_density': entanglement, 'phase_alignment': 0.5, 'information_flow': (1.0, 2.0)}
+
+def test_restart_rebuilds_the_live_q_table(tmp_path, monkeypatch):
+    # Experience replay samples at random and is not journaled
+    monkeypatch.setattr(ada_neural_core, 'REPLAY_EVERY', 10 ** 9)
+    live = ADAEngine(state_dir=str(tmp_path))
+    live.state_store.snapshot_every = 7
+    rng = np.random.default_rng(0)
+    for step in range(60):
+        # Several observations between feedbacks, so the next state differs
+        # from the state of the next feedback
+        for _ in range(rng.integers(1, 4)):
+            live.observe_quantum(quantum(rng.random()))
+        live.learn_from_feedback("positive" if step % 3 else "negative")
+    live.state_store.close()
+
+    restarted = ADAEngine(state_dir=str(tmp_path))
+    np.testing.assert_array_equal(restarted.q_table, live.q_table)
+    assert restarted.pending_transition == live.pending_transition
+    assert restarted.improvement_counter == live.improvement_counter
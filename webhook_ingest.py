@@ -0,0 +1,180 @@
+import json
+import os
+import queue
+import threading
+import time
+import atexit
+from collections import OrderedDict
+from ai_ada_engine.state_store import read_journal
+from instrumentation import timed
+
+class SeenSet:
+    """
+    Bounded set of recently seen event ids; the oldest ids are forgotten
+    once capacity is reached.
+    """
+    def __init__(self, capacity=100000):
+        self.capacity = capacity
+        self.ids = OrderedDict()
+
+    def add(self, event_id):
+        # Returns False if the id was already present
+        if event_id in self.ids:
+            self.ids.move_to_end(event_id)
+            return False
+        self.ids[event_id] = None
+        if len(self.ids) > self.capacity:
+            self.ids.popitem(last=False)
+        return True
+
+    def discard(self, event_id):
+        self.ids.pop(event_id, None)
+
+    def __len__(self):
+        return len(self.ids)
+
+class DeadLetterStore:
+    """
+    Events that failed after being acknowledged, one JSON line each. The
+    provider never redelivers an event it got a 2xx for, so this file is
+    the only copy of them; WebhookIngestor.retry_dead_letters() resubmits it.
+    """
+    def __init__(self, path='ada_state/webhook_dead_letters.jsonl'):
+        self.path = path
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def append(self, failures):
+        # failures: iterable of (event_id, event, error)
+        lines = [json.dumps({'ts': time.time(), 'id': event_id, 'error': str(error), 'event': event})
+                 for event_id, event, error in failures]
+        if not lines:
+            return
+        with self.lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+
+    def take_all(self):
+        """
+        Returns the stored records and empties the store.
+        """
+        with self.lock:
+            if not os.path.exists(self.path):
+                return []
+            records = read_journal(self.path)
+            os.remove(self.path)
+        return records
+
+class WebhookIngestor:
+    """
+    Accepts verified webhook events without processing them in the request
+    thread. handler(events) is called from the worker threads with batches
+    of up to batch_size events and returns (event, error) pairs for the
+    events it failed on (or None). Duplicate deliveries of an event id are
+    dropped at submit time. The request was already answered 202, so failed
+    events go to the dead-letter store rather than back to the provider.
+    """
+    def __init__(self, handler, workers=2, batch_size=64, max_queue=10000, seen_capacity=100000,
+                 dead_letters=None):
+        self.handler = handler
+        self.batch_size = batch_size
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.seen = SeenSet(seen_capacity)
+        self.dead_letters = dead_letters or DeadLetterStore()
+        self.lock = threading.Lock()
+        self.stats = {'accepted': 0, 'duplicates': 0, 'rejected': 0, 'processed': 0, 'failed': 0, 'batches': 0,
+                      'retried': 0}
+        self.stop_event = threading.Event()
+        self.workers = [
+            threading.Thread(target=self.worker_loop, name=f"webhook-worker-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+        atexit.register(self.close)
+
+    def submit(self, event_id, event):
+        """
+        Returns 'accepted', 'duplicate' or 'rejected' (queue full).
+        """
+        with self.lock:
+            if not self.seen.add(event_id):
+                self.stats['duplicates'] += 1
+                return 'duplicate'
+            try:
+                self.queue.put_nowait((event_id, event))
+            except queue.Full:
+                # Forget the id so the provider's retry is accepted later
+                self.seen.discard(event_id)
+                self.stats['rejected'] += 1
+                return 'rejected'
+            self.stats['accepted'] += 1
+        return 'accepted'
+
+    def worker_loop(self):
+        while True:
+            try:
+                batch = [self.queue.get(timeout=0.5)]
+            except queue.Empty:
+                if self.stop_event.is_set():
+                    return
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            self.process_batch(batch)
+            for _ in batch:
+                self.queue.task_done()
+
+    @timed("webhook_batch")
+    def process_batch(self, batch):
+        events = [event for _, event in batch]
+        try:
+            failed = self.handler(events) or []
+        except Exception as e:
+            print(f"[Webhook] Batch of {len(batch)} events failed: {e}")
+            failed = [(event, e) for event in events]
+        errors = {id(event): error for event, error in failed}
+        self.dead_letters.append((event_id, event, errors[id(event)])
+                                 for event_id, event in batch if id(event) in errors)
+        with self.lock:
+            self.stats['batches'] += 1
+            self.stats['processed'] += len(batch) - len(errors)
+            self.stats['failed'] += len(errors)
+
+    def retry_dead_letters(self):
+        """
+        Resubmits every dead-lettered event; events that fail again are
+        dead-lettered again. Returns the number resubmitted.
+        """
+        records = self.dead_letters.take_all()
+        with self.lock:
+            for record in records:
+                self.seen.discard(record['id'])
+        for record in records:
+            if self.submit(record['id'], record['event']) == 'rejected':
+                self.dead_letters.append([(record['id'], record['event'], record['error'])])
+        with self.lock:
+            self.stats['retried'] += len(records)
+        return len(records)
+
+    def flush(self):
+        self.queue.join()
+
+    def close(self):
+        if not self.stop_event.is_set():
+            self.flush()
+            self.stop_event.set()
+            for worker in self.workers:
+                worker.join()
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['seen'] = len(self.seen)
+        stats['queue_depth'] = self.queue.qsize()
+        return stats
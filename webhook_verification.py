@@ -0,0 +1,201 @@
+# webhook_verification.py – PayPal webhook signature checks with cached certificates
+#
+# PayPal signs "<transmission id>|<transmission time>|<webhook id>|<crc32 of
+# body>" with SHA256withRSA and sends the signing certificate's URL in
+# Paypal-Cert-Url. Fetching and parsing that certificate is the expensive
+# part, so parsed public keys are cached per URL for `ttl` seconds; a cache
+# hit costs one RSA verify.
+#
+# LocalProvider signs deliveries the same way with an in-memory self-signed
+# certificate, and HMACVerifier is a shared-secret variant, so verification
+# can be tested and benchmarked offline.
+
+import base64
+import datetime
+import hashlib
+import hmac
+import os
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+DEFAULT_WEBHOOK_ID = "6T150257H83796942"
+CERT_HOST_SUFFIXES = (".paypal.com",)
+
+def signing_string(headers, payload, webhook_id):
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+    return "|".join([
+        headers.get('Paypal-Transmission-Id', ''),
+        headers.get('Paypal-Transmission-Time', ''),
+        webhook_id,
+        str(zlib.crc32(payload) & 0xffffffff)
+    ]).encode('utf-8')
+
+def fetch_certificate(cert_url):
+    # Only fetch certificates PayPal could have issued
+    parsed = urlparse(cert_url)
+    if parsed.scheme != "https" or not (parsed.hostname or "").endswith(CERT_HOST_SUFFIXES):
+        raise ValueError(f"Refusing to fetch certificate from {cert_url}")
+    import requests
+    response = requests.get(cert_url, timeout=10)
+    response.raise_for_status()
+    return response.content
+
+class CertificateCache:
+    """
+    Parsed public keys keyed by certificate URL. An entry expires after
+    `ttl` seconds or when the certificate itself does, whichever is first.
+    """
+    def __init__(self, fetcher=fetch_certificate, ttl=3600, max_entries=32):
+        self.fetcher = fetcher
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def get_public_key(self, cert_url):
+        now = time.monotonic()
+        with self.lock:
+            entry = self.entries.get(cert_url)
+            if entry is not None and entry[1] > now:
+                self.entries.move_to_end(cert_url)
+                self.stats['hits'] += 1
+                return entry[0]
+            self.stats['misses'] += 1
+        # Fetch outside the lock so a slow download doesn't block cache hits
+        public_key, lifetime = self.load(cert_url)
+        with self.lock:
+            self.entries[cert_url] = (public_key, now + min(self.ttl, lifetime))
+            self.entries.move_to_end(cert_url)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return public_key
+
+    def load(self, cert_url):
+        from cryptography import x509
+        certificate = x509.load_pem_x509_certificate(self.fetcher(cert_url))
+        not_after = certificate.not_valid_after_utc
+        lifetime = (not_after - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+        if lifetime <= 0:
+            raise ValueError(f"Certificate at {cert_url} expired at {not_after.isoformat()}")
+        return certificate.public_key(), lifetime
+
+    def invalidate(self, cert_url=None):
+        with self.lock:
+            if cert_url is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(cert_url, None)
+
+class PayPalVerifier:
+    def __init__(self, webhook_id=None, cert_cache=None):
+        self.webhook_id = webhook_id or os.environ.get("PAYPAL_WEBHOOK_ID", DEFAULT_WEBHOOK_ID)
+        self.cert_cache = cert_cache or CertificateCache()
+
+    def verify(self, headers, payload):
+        from cryptography.exceptions import InvalidSignature
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        if headers.get('Paypal-Auth-Algo', 'SHA256withRSA') != 'SHA256withRSA':
+            return False
+        cert_url = headers.get('Paypal-Cert-Url')
+        signature = headers.get('Paypal-Transmission-Sig')
+        if not cert_url or not signature:
+            return False
+        try:
+            public_key = self.cert_cache.get_public_key(cert_url)
+            public_key.verify(base64.b64decode(signature), signing_string(headers, payload, self.webhook_id),
+                              padding.PKCS1v15(), hashes.SHA256())
+        except (InvalidSignature, ValueError, OSError) as e:
+            print(f"[Webhook] Signature verification failed: {e or type(e).__name__}")
+            return False
+        return True
+
+class HMACVerifier:
+    """
+    Shared-secret stand-in for the provider's RSA signature.
+    """
+    def __init__(self, secret, webhook_id=None):
+        self.secret = secret.encode('utf-8') if isinstance(secret, str) else secret
+        self.webhook_id = webhook_id or os.environ.get("PAYPAL_WEBHOOK_ID", DEFAULT_WEBHOOK_ID)
+
+    def sign(self, headers, payload):
+        digest = hmac.new(self.secret, signing_string(headers, payload, self.webhook_id), hashlib.sha256).digest()
+        return base64.b64encode(digest).decode('ascii')
+
+    def verify(self, headers, payload):
+        signature = headers.get('Paypal-Transmission-Sig')
+        if not signature:
+            return False
+        return hmac.compare_digest(signature, self.sign(headers, payload))
+
+class LocalProvider:
+    """
+    Signs webhook deliveries like PayPal does, using a key pair and
+    self-signed certificate generated in memory. verifier() returns a
+    PayPalVerifier whose certificate fetches are served locally.
+    """
+    def __init__(self, webhook_id=None, cert_url="https://api.local.paypal.com/v1/notifications/certs/LOCAL", key_size=2048):
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import rsa
+        from cryptography.x509.oid import NameOID
+
+        self.webhook_id = webhook_id or os.environ.get("PAYPAL_WEBHOOK_ID", DEFAULT_WEBHOOK_ID)
+        self.cert_url = cert_url
+        self.private_key = rsa.generate_private_key(public_exponent=65537, key_size=key_size)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "local webhook provider")])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        certificate = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(self.private_key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(minutes=5))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .sign(self.private_key, hashes.SHA256())
+        )
+        self.certificate_pem = certificate.public_bytes(serialization.Encoding.PEM)
+        self.fetches = 0
+
+    def fetch(self, cert_url):
+        if cert_url != self.cert_url:
+            raise ValueError(f"Unknown certificate URL {cert_url}")
+        self.fetches += 1
+        return self.certificate_pem
+
+    def headers(self, payload, transmission_id, transmission_time=None):
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.asymmetric import padding
+
+        headers = {
+            'Paypal-Transmission-Id': transmission_id,
+            'Paypal-Transmission-Time': transmission_time or datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+            'Paypal-Auth-Algo': 'SHA256withRSA',
+            'Paypal-Cert-Url': self.cert_url
+        }
+        signature = self.private_key.sign(signing_string(headers, payload, self.webhook_id),
+                                          padding.PKCS1v15(), hashes.SHA256())
+        headers['Paypal-Transmission-Sig'] = base64.b64encode(signature).decode('ascii')
+        return headers
+
+    def verifier(self, ttl=3600):
+        return PayPalVerifier(self.webhook_id, CertificateCache(fetcher=self.fetch, ttl=ttl))
+
+def create_verifier():
+    """
+    WEBHOOK_VERIFIER=paypal (default) checks real PayPal signatures;
+    WEBHOOK_VERIFIER=hmac checks against WEBHOOK_HMAC_SECRET.
+    """
+    kind = os.environ.get("WEBHOOK_VERIFIER", "paypal")
+    if kind == "hmac":
+        return HMACVerifier(os.environ["WEBHOOK_HMAC_SECRET"])
+    if kind == "paypal":
+        return PayPalVerifier()
+    raise ValueError(f"Unknown WEBHOOK_VERIFIER {kind!r}")